@@ -0,0 +1,93 @@
+"""Per-square attack counts that follow edits incrementally.
+
+An AttackMap counts, for each side and square, how many pieces attack the
+square. Edits made through ``AttackMap.set_piece`` update the counts by
+touching only what the edit can change: the attacks of the old and new piece
+on the edited square, and the attacks of sliders whose rays pass through it
+when the square turns from empty to occupied or back. Everything else keeps
+its counts, so dragging a piece around costs a few table lookups instead of
+a full recount.
+"""
+
+from typing import Optional
+
+from chess_editor.attacks import bishop_attacks, piece_attacks, rook_attacks
+from chess_editor.board import ChessBoard, Piece, PieceColor
+from chess_editor.utils.bitboard import iter_squares
+
+# Bitboard offsets of the sliders within each color's six bitboards
+_BISHOP, _ROOK, _QUEEN = 2, 3, 4
+
+
+class AttackMap:
+    """Attack counts of a board, kept in step with edits made through this map.
+
+    ``counts[color index][square]`` is the number of white (index 0) or black
+    (index 1) pieces attacking the square. Changes made to the board other than
+    through ``set_piece`` (moves, clear, FEN loads) need a ``refresh()``.
+    """
+
+    def __init__(self, board: ChessBoard):
+        self.board = board
+        self.counts: list[list[int]] = [[0] * 64, [0] * 64]
+        self.refresh()
+
+    def refresh(self):
+        """Recount every attack from scratch."""
+        self.counts = [[0] * 64, [0] * 64]
+        occupied = self.board.occupied
+        for square in iter_squares(occupied):
+            piece = self.board.piece_at(square)
+            self._add(piece.color, piece_attacks(piece.piece_type, piece.color, square, occupied), 1)
+
+    def set_piece(self, row: int, col: int, piece: Optional[Piece]) -> bool:
+        """Set piece at position (row, col) on the board and update the counts. Returns True if successful."""
+        if not (0 <= row < 8 and 0 <= col < 8):
+            return False
+        board = self.board
+        square = row * 8 + col
+        old = board.piece_at(square)
+        before = board.occupied
+        if old is not None:
+            self._add(old.color, piece_attacks(old.piece_type, old.color, square, before), -1)
+
+        board.set_piece(row, col, piece)
+        after = board.occupied
+        if before != after:
+            self._update_sliders(square, before, after)
+        if piece is not None:
+            self._add(piece.color, piece_attacks(piece.piece_type, piece.color, square, after), 1)
+        return True
+
+    def attack_count(self, color: PieceColor, square: int) -> int:
+        """Number of pieces of the given color attacking square."""
+        return self.counts[0 if color is PieceColor.WHITE else 1][square]
+
+    def balance(self, square: int) -> int:
+        """White attackers minus black attackers of square, for control heatmaps."""
+        return self.counts[0][square] - self.counts[1][square]
+
+    def _update_sliders(self, square: int, before: int, after: int):
+        # Sliders that see square have their ray beyond it opened or closed; the
+        # occupancy of square itself does not matter for which sliders see it
+        bitboards = self.board.bitboards
+        straight = rook_attacks(square, after)
+        diagonal = bishop_attacks(square, after)
+        for us, base in ((0, 0), (1, 6)):
+            queens = bitboards[base + _QUEEN]
+            for slider in iter_squares(straight & (bitboards[base + _ROOK] | queens)):
+                self._replace(us, rook_attacks(slider, before), rook_attacks(slider, after))
+            for slider in iter_squares(diagonal & (bitboards[base + _BISHOP] | queens)):
+                self._replace(us, bishop_attacks(slider, before), bishop_attacks(slider, after))
+
+    def _replace(self, us: int, old: int, new: int):
+        counts = self.counts[us]
+        for square in iter_squares(old & ~new):
+            counts[square] -= 1
+        for square in iter_squares(new & ~old):
+            counts[square] += 1
+
+    def _add(self, color: PieceColor, attacks: int, delta: int):
+        counts = self.counts[0 if color is PieceColor.WHITE else 1]
+        for square in iter_squares(attacks):
+            counts[square] += delta
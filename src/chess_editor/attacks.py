@@ -0,0 +1,280 @@
+"""Precomputed attack tables.
+
+Leaper attacks are plain per-square lookups. Sliding attacks use a perfect hash
+per square in the spirit of magic bitboards: the occupancy is masked down to
+the squares that can block the piece, and that masked value keys a dict of
+attack sets. In CPython a dict probe on the masked int is cheaper than a
+magic multiply-and-shift, and needs no magic numbers.
+
+Tables are built on first use rather than at import. When the
+``CHESS_EDITOR_CACHE_DIR`` environment variable is set, built tables are also
+stored there as raw uint64 arrays and loaded on later runs.
+"""
+
+import os
+from array import array
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import NamedTuple
+
+from chess_editor.board import PieceColor, PieceType
+from chess_editor.utils.bitboard import iter_squares
+
+CACHE_DIR_ENV = "CHESS_EDITOR_CACHE_DIR"
+# Bump when the layout or contents of any cached table change
+_CACHE_VERSION = 1
+
+# Ray directions as (row step, col step); row 0 is rank 8, so NORTH is row - 1
+NORTH, NORTH_EAST, EAST, SOUTH_EAST, SOUTH, SOUTH_WEST, WEST, NORTH_WEST = range(8)
+DIRECTIONS = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+ROOK_DIRECTIONS = (NORTH, EAST, SOUTH, WEST)
+BISHOP_DIRECTIONS = (NORTH_EAST, SOUTH_EAST, SOUTH_WEST, NORTH_WEST)
+
+_KNIGHT_STEPS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+
+class AttackTables(NamedTuple):
+    """Attack bitboards indexed by square (and color or direction where noted)."""
+    knight: tuple[int, ...]
+    king: tuple[int, ...]
+    # pawn[color index][square], white = 0
+    pawn: tuple[tuple[int, ...], tuple[int, ...]]
+    # rays[direction][square], excluding the origin square
+    rays: tuple[tuple[int, ...], ...]
+    # between[a][b]: squares strictly between a and b if they share a line, else 0
+    between: tuple[tuple[int, ...], ...]
+    # line[a][b]: the full board line through a and b if they share one, else 0
+    line: tuple[tuple[int, ...], ...]
+
+
+def _step_mask(square: int, steps) -> int:
+    row, col = square >> 3, square & 7
+    mask = 0
+    for drow, dcol in steps:
+        r, c = row + drow, col + dcol
+        if 0 <= r < 8 and 0 <= c < 8:
+            mask |= 1 << (r * 8 + c)
+    return mask
+
+
+def _ray_mask(square: int, direction: int) -> int:
+    drow, dcol = DIRECTIONS[direction]
+    r, c = (square >> 3) + drow, (square & 7) + dcol
+    mask = 0
+    while 0 <= r < 8 and 0 <= c < 8:
+        mask |= 1 << (r * 8 + c)
+        r, c = r + drow, c + dcol
+    return mask
+
+
+def _build_leaper_tables() -> array:
+    values = array("Q")
+    values.extend(_step_mask(sq, _KNIGHT_STEPS) for sq in range(64))
+    values.extend(_step_mask(sq, DIRECTIONS) for sq in range(64))
+    values.extend(_step_mask(sq, ((-1, -1), (-1, 1))) for sq in range(64))
+    values.extend(_step_mask(sq, ((1, -1), (1, 1))) for sq in range(64))
+    for direction in range(8):
+        values.extend(_ray_mask(sq, direction) for sq in range(64))
+    return values
+
+
+def _positive(direction: int) -> bool:
+    # Directions whose squares have increasing indices, so the nearest blocker is the lowest bit
+    return direction in (EAST, SOUTH_EAST, SOUTH, SOUTH_WEST)
+
+
+def _relevant_mask(square: int, directions) -> int:
+    # Squares on the rays that can block, i.e. every ray square except the last one
+    mask = 0
+    for direction in directions:
+        ray_mask = _ray_mask(square, direction)
+        if ray_mask:
+            if _positive(direction):
+                edge = 1 << (ray_mask.bit_length() - 1)
+            else:
+                edge = ray_mask & -ray_mask
+            mask |= ray_mask ^ edge
+    return mask
+
+
+def _slow_slider_attacks(square: int, occupied: int, directions, rays) -> int:
+    attacks = 0
+    for direction in directions:
+        ray_mask = rays[direction][square]
+        blockers = ray_mask & occupied
+        if blockers:
+            if _positive(direction):
+                nearest = (blockers & -blockers).bit_length() - 1
+            else:
+                nearest = blockers.bit_length() - 1
+            ray_mask ^= rays[direction][nearest]
+        attacks |= ray_mask
+    return attacks
+
+
+def _subsets(mask: int):
+    # Carry-rippler enumeration of every subset of mask, starting with 0
+    subset = 0
+    while True:
+        yield subset
+        subset = (subset - mask) & mask
+        if not subset:
+            return
+
+
+def _build_slider_tables(masks, directions) -> array:
+    rays = attack_tables().rays
+    values = array("Q")
+    for square in range(64):
+        values.extend(
+            _slow_slider_attacks(square, subset, directions, rays) for subset in _subsets(masks[square])
+        )
+    return values
+
+
+def _line_tables(rays) -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for a in range(64):
+        for direction in range(8):
+            opposite = (direction + 4) % 8
+            full = rays[direction][a] | rays[opposite][a] | 1 << a
+            for b in iter_squares(rays[direction][a]):
+                between[a][b] = rays[direction][a] & rays[opposite][b]
+                line[a][b] = full
+    return tuple(map(tuple, between)), tuple(map(tuple, line))
+
+
+def cached_array(name: str, size: int, build: Callable[[], array]) -> array:
+    """Return build() (a uint64 array of size items), going through the disk cache if enabled."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return build()
+
+    path = Path(cache_dir) / f"{name}-v{_CACHE_VERSION}.bin"
+    values = array("Q")
+    try:
+        values.frombytes(path.read_bytes())
+        if len(values) == size:
+            return values
+    except (OSError, ValueError):
+        pass
+
+    values = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(values.tobytes())
+        tmp.replace(path)
+    except OSError:
+        pass
+    return values
+
+
+@cache
+def attack_tables() -> AttackTables:
+    """Return the leaper and ray tables, building them on first call."""
+    values = cached_array("leapers", 12 * 64, _build_leaper_tables)
+    chunks = [tuple(values[i:i + 64]) for i in range(0, len(values), 64)]
+    rays = tuple(chunks[4:12])
+    between, line = _line_tables(rays)
+    return AttackTables(
+        knight=chunks[0],
+        king=chunks[1],
+        pawn=(chunks[2], chunks[3]),
+        rays=rays,
+        between=between,
+        line=line,
+    )
+
+
+def knight_attacks(square: int) -> int:
+    """Squares attacked by a knight on square."""
+    return attack_tables().knight[square]
+
+
+def king_attacks(square: int) -> int:
+    """Squares attacked by a king on square."""
+    return attack_tables().king[square]
+
+
+def pawn_attacks(color: PieceColor, square: int) -> int:
+    """Squares attacked by a pawn of the given color on square."""
+    return attack_tables().pawn[0 if color is PieceColor.WHITE else 1][square]
+
+
+def ray(direction: int, square: int) -> int:
+    """Squares from square (exclusive) to the board edge in one direction."""
+    return attack_tables().rays[direction][square]
+
+
+def between(a: int, b: int) -> int:
+    """Squares strictly between a and b, or 0 if they are not on a common line."""
+    return attack_tables().between[a][b]
+
+
+def line(a: int, b: int) -> int:
+    """The full rank, file or diagonal through a and b, or 0 if there is none."""
+    return attack_tables().line[a][b]
+
+
+class SliderTables(NamedTuple):
+    """Per-square blocker masks and masked-occupancy -> attacks lookups."""
+    rook_masks: tuple[int, ...]
+    rook: tuple[dict[int, int], ...]
+    bishop_masks: tuple[int, ...]
+    bishop: tuple[dict[int, int], ...]
+
+
+def _slider_lookup(name: str, directions) -> tuple[tuple[int, ...], tuple[dict[int, int], ...]]:
+    masks = tuple(_relevant_mask(sq, directions) for sq in range(64))
+    size = sum(1 << mask.bit_count() for mask in masks)
+    values = cached_array(name, size, lambda: _build_slider_tables(masks, directions))
+    lookups = []
+    start = 0
+    for mask in masks:
+        end = start + (1 << mask.bit_count())
+        lookups.append(dict(zip(_subsets(mask), values[start:end])))
+        start = end
+    return masks, tuple(lookups)
+
+
+@cache
+def slider_tables() -> SliderTables:
+    """Return the rook and bishop lookups, building them on first call."""
+    rook_masks, rook = _slider_lookup("rook", ROOK_DIRECTIONS)
+    bishop_masks, bishop = _slider_lookup("bishop", BISHOP_DIRECTIONS)
+    return SliderTables(rook_masks, rook, bishop_masks, bishop)
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """Squares attacked by a rook on square given the occupied bitboard."""
+    tables = slider_tables()
+    return tables.rook[square][occupied & tables.rook_masks[square]]
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """Squares attacked by a bishop on square given the occupied bitboard."""
+    tables = slider_tables()
+    return tables.bishop[square][occupied & tables.bishop_masks[square]]
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    """Squares attacked by a queen on square given the occupied bitboard."""
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def piece_attacks(piece_type: PieceType, color: PieceColor, square: int, occupied: int) -> int:
+    """Squares attacked by a piece on square given the occupied bitboard."""
+    if piece_type is PieceType.PAWN:
+        return pawn_attacks(color, square)
+    if piece_type is PieceType.KNIGHT:
+        return knight_attacks(square)
+    if piece_type is PieceType.KING:
+        return king_attacks(square)
+    if piece_type is PieceType.BISHOP:
+        return bishop_attacks(square, occupied)
+    if piece_type is PieceType.ROOK:
+        return rook_attacks(square, occupied)
+    return queen_attacks(square, occupied)
@@ -0,0 +1,144 @@
+"""Vectorized container for many board placements."""
+
+from collections.abc import Iterable
+from typing import Optional
+
+import numpy as np
+
+from chess_editor.board import ENCODED_SIZE, PIECE_INDEX, ChessBoard, PieceColor, PieceType
+from chess_editor.position import CASTLING_SHIFT, EP_SHIFT, POSITION_SIZE, Position
+
+_SHIFTS = np.arange(64, dtype=np.uint64)
+_CASTLING_MASK = np.uint64(0xF << CASTLING_SHIFT)
+_EP_MASK = np.uint64(0x7F << EP_SHIFT)
+
+
+class BoardBatch:
+    """N board placements stored as an (N, 12) uint64 array of bitboards.
+
+    Column ``i`` holds the bitboard of ``PIECES[i]``, using the same bit layout
+    as ``ChessBoard.bitboards``. ``states`` optionally holds each position's
+    packed game state (``Position.state``) as an (N,) uint64 array.
+    """
+
+    def __init__(self, bitboards: np.ndarray, states: Optional[np.ndarray] = None):
+        if bitboards.ndim != 2 or bitboards.shape[1] != 12:
+            raise ValueError(f"Expected an (N, 12) array, got shape {bitboards.shape}")
+        if states is not None and states.shape != (len(bitboards),):
+            raise ValueError(f"Expected ({len(bitboards)},) states, got shape {states.shape}")
+        self.bitboards = np.ascontiguousarray(bitboards, dtype=np.uint64)
+        self.states = None if states is None else np.ascontiguousarray(states, dtype=np.uint64)
+
+    @classmethod
+    def from_boards(cls, boards: Iterable[ChessBoard]) -> "BoardBatch":
+        """Build a batch from ChessBoard objects."""
+        rows = [board.bitboards for board in boards]
+        return cls(np.array(rows, dtype=np.uint64).reshape(len(rows), 12))
+
+    @classmethod
+    def from_squares(cls, squares: np.ndarray) -> "BoardBatch":
+        """Build a batch from an (N, 64) array of square codes (0 empty, piece.index + 1)."""
+        squares = np.asarray(squares)
+        bitboards = np.empty((len(squares), 12), dtype=np.uint64)
+        for index in range(12):
+            bits = (squares == index + 1).astype(np.uint64) << _SHIFTS
+            bitboards[:, index] = np.bitwise_or.reduce(bits, axis=1)
+        return cls(bitboards)
+
+    @classmethod
+    def from_packed(cls, packed: np.ndarray, states: Optional[np.ndarray] = None) -> "BoardBatch":
+        """Build a batch from an (N, 32) uint8 array of ChessBoard.to_bytes() records."""
+        if ((packed >> 4) > 12).any() or ((packed & 0xF) > 12).any():
+            raise ValueError("Invalid square code in packed boards")
+        squares = np.empty((len(packed), 64), dtype=np.int8)
+        squares[:, 0::2] = packed >> 4
+        squares[:, 1::2] = packed & 0xF
+        return cls(cls.from_squares(squares).bitboards, states)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "BoardBatch":
+        """Decode consecutive 32-byte ChessBoard.to_bytes() records."""
+        return cls.from_packed(np.frombuffer(buffer, dtype=np.uint8).reshape(-1, ENCODED_SIZE))
+
+    @classmethod
+    def from_position_buffer(cls, buffer) -> "BoardBatch":
+        """Decode consecutive Position.to_bytes() records, keeping their states."""
+        records = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, POSITION_SIZE)
+        states = records[:, ENCODED_SIZE:].copy().view("<u8").reshape(-1)
+        return cls.from_packed(records[:, :ENCODED_SIZE], states)
+
+    def __len__(self) -> int:
+        return len(self.bitboards)
+
+    def __getitem__(self, index: int) -> ChessBoard:
+        return ChessBoard.from_bitboards(self.bitboards[index].tolist())
+
+    def position(self, index: int) -> Position:
+        """Return one entry as a Position; the batch must have states."""
+        if self.states is None:
+            raise ValueError("Batch has no game states")
+        board = ChessBoard.from_bitboards(self.bitboards[index].tolist())
+        return Position.from_state(board, int(self.states[index]))
+
+    def to_boards(self) -> list[ChessBoard]:
+        """Convert every position back to a ChessBoard."""
+        return [ChessBoard.from_bitboards(row) for row in self.bitboards.tolist()]
+
+    def to_squares(self) -> np.ndarray:
+        """Return an (N, 64) int8 array of square codes (0 empty, piece.index + 1)."""
+        squares = np.zeros((len(self), 64), dtype=np.int8)
+        for index in range(12):
+            bits = (self.bitboards[:, index, None] >> _SHIFTS) & 1
+            squares += bits.astype(np.int8) * (index + 1)
+        return squares
+
+    def occupancy(self) -> np.ndarray:
+        """Occupied-square bitboard of each position, shape (N,)."""
+        return np.bitwise_or.reduce(self.bitboards, axis=1)
+
+    def color_occupancy(self, color: PieceColor) -> np.ndarray:
+        """Bitboard of the given color's pieces in each position, shape (N,)."""
+        start = 0 if color is PieceColor.WHITE else 6
+        return np.bitwise_or.reduce(self.bitboards[:, start:start + 6], axis=1)
+
+    def piece_counts(self) -> np.ndarray:
+        """Per-piece counts, shape (N, 12) in PIECES order."""
+        return np.bitwise_count(self.bitboards)
+
+    def count(self, piece_type: PieceType, color: PieceColor) -> np.ndarray:
+        """Number of pieces of one type and color in each position, shape (N,)."""
+        return np.bitwise_count(self.bitboards[:, PIECE_INDEX[(color, piece_type)]])
+
+    def mirrored(self) -> "BoardBatch":
+        """Flip every position top to bottom (rank 1 <-> rank 8), moving en-passant squares along."""
+        # One byte per row, so reversing byte order reverses the rows
+        return BoardBatch(self.bitboards.byteswap(), self._mirrored_states(flip_colors=False))
+
+    def color_flipped(self) -> "BoardBatch":
+        """Mirror every position and swap the piece colors, side to move and castling rights."""
+        return BoardBatch(np.roll(self.bitboards.byteswap(), 6, axis=1), self._mirrored_states(flip_colors=True))
+
+    def equal(self, other: "BoardBatch") -> np.ndarray:
+        """Element-wise position equality with another batch, shape (N,).
+
+        Game states are compared too when both batches have them.
+        """
+        same = np.all(self.bitboards == other.bitboards, axis=1)
+        if self.states is not None and other.states is not None:
+            same &= self.states == other.states
+        return same
+
+    def _mirrored_states(self, flip_colors: bool) -> Optional[np.ndarray]:
+        if self.states is None:
+            return None
+        states = self.states
+        # The en-passant field holds square + 1; mirroring a square flips its row bits
+        ep = (states & _EP_MASK) >> np.uint64(EP_SHIFT)
+        ep = np.where(ep != 0, ((ep - np.uint64(1)) ^ np.uint64(56)) + np.uint64(1), ep)
+        states = (states & ~_EP_MASK) | (ep << np.uint64(EP_SHIFT))
+        if flip_colors:
+            castling = (states & _CASTLING_MASK) >> np.uint64(CASTLING_SHIFT)
+            castling = (castling >> np.uint64(2)) | ((castling & np.uint64(3)) << np.uint64(2))
+            states = (states & ~_CASTLING_MASK) | (castling << np.uint64(CASTLING_SHIFT))
+            states = states ^ np.uint64(1)
+        return states
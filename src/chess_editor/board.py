@@ -1,7 +1,12 @@
 """Chess board model and piece definitions."""
 
+from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
-from typing import Optional
+from typing import NamedTuple, Optional
+
+from chess_editor.utils.bitboard import SQUARE_NAMES, iter_squares, square_name
+from chess_editor.zobrist import PIECE_SQUARE_KEYS, state_key
 
 
 class PieceColor(Enum):
@@ -20,8 +25,26 @@ class PieceType(Enum):
     PAWN = "pawn"
 
 
+# Bitboard ordering: PIECE_TYPES within each color, white first
+COLORS = (PieceColor.WHITE, PieceColor.BLACK)
+PIECE_TYPES = (
+    PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP,
+    PieceType.ROOK, PieceType.QUEEN, PieceType.KING,
+)
+PIECE_INDEX = {
+    (color, piece_type): ci * 6 + ti
+    for ci, color in enumerate(COLORS)
+    for ti, piece_type in enumerate(PIECE_TYPES)
+}
+
+
 class Piece:
-    """Represents a chess piece."""
+    """Represents a chess piece.
+
+    Pieces are interned: constructing the same type and color twice returns the
+    same object, so boards share the 12 instances and equality is identity.
+    The shared instances are immutable.
+    """
 
     # Unicode chess pieces
     SYMBOLS = {
@@ -39,9 +62,34 @@ class Piece:
         (PieceColor.BLACK, PieceType.PAWN): "♟",
     }
 
-    def __init__(self, piece_type: PieceType, color: PieceColor):
-        self.piece_type = piece_type
-        self.color = color
+    __slots__ = ("piece_type", "color", "index")
+
+    # The 12 interned instances, keyed by (piece_type, color)
+    _interned: dict[tuple[PieceType, PieceColor], "Piece"] = {}
+
+    def __new__(cls, piece_type: PieceType, color: PieceColor):
+        piece = cls._interned.get((piece_type, color))
+        if piece is None:
+            piece = super().__new__(cls)
+            object.__setattr__(piece, "piece_type", piece_type)
+            object.__setattr__(piece, "color", color)
+            object.__setattr__(piece, "index", PIECE_INDEX[(color, piece_type)])
+            cls._interned[(piece_type, color)] = piece
+        return piece
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"Piece instances are shared and immutable; cannot set {name!r}")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Piece instances are shared and immutable; cannot delete {name!r}")
+
+    @classmethod
+    def of(cls, piece_type: PieceType, color: PieceColor) -> "Piece":
+        """Return the shared Piece instance for a type and color."""
+        return cls._interned[(piece_type, color)]
+
+    def __reduce__(self):
+        return Piece, (self.piece_type, self.color)
 
     def __str__(self) -> str:
         return self.SYMBOLS[(self.color, self.piece_type)]
@@ -50,12 +98,300 @@ class Piece:
         return f"Piece({self.piece_type.value}, {self.color.value})"
 
 
+# Packed 16-bit moves: bits 0-5 from square, bits 6-11 to square, bits 12-14
+# promotion code (index into PROMOTION_CODES, 0 for none)
+PROMOTION_CODES: tuple[Optional[PieceType], ...] = (
+    None, PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN,
+)
+_PROMOTION_CODE = {piece_type: code for code, piece_type in enumerate(PROMOTION_CODES)}
+
+
+def pack_move(from_square: int, to_square: int, promotion: Optional[PieceType] = None) -> int:
+    """Pack a move into 16 bits."""
+    return from_square | to_square << 6 | _PROMOTION_CODE[promotion] << 12
+
+
+class Move(NamedTuple):
+    """A move from one square index to another, with the promotion piece if any.
+
+    This is the readable form; move generation and make/unmake work on the
+    packed 16-bit ints produced by ``pack()`` and accepted by ``unpack()``.
+    """
+    from_square: int
+    to_square: int
+    promotion: Optional[PieceType] = None
+
+    @classmethod
+    def unpack(cls, code: int) -> "Move":
+        """Decode a packed 16-bit move."""
+        return cls(code & 63, code >> 6 & 63, PROMOTION_CODES[code >> 12])
+
+    def pack(self) -> int:
+        """Encode as a packed 16-bit move."""
+        return pack_move(self.from_square, self.to_square, self.promotion)
+
+    def uci(self) -> str:
+        """Return the move in UCI notation, e.g. "e2e4" or "e7e8q"."""
+        suffix = _PROMOTION_LETTERS[self.promotion] if self.promotion else ""
+        return square_name(self.from_square) + square_name(self.to_square) + suffix
+
+
+_PROMOTION_LETTERS = {
+    PieceType.QUEEN: "q", PieceType.ROOK: "r", PieceType.BISHOP: "b", PieceType.KNIGHT: "n",
+}
+
+
+# Castling rights bit flags
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+
+# Castling rights kept when a piece moves from or to each square
+_CASTLING_KEEP = [ALL_CASTLING] * 64
+_CASTLING_KEEP[0] &= ~BLACK_QUEENSIDE
+_CASTLING_KEEP[4] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+_CASTLING_KEEP[7] &= ~BLACK_KINGSIDE
+_CASTLING_KEEP[56] &= ~WHITE_QUEENSIDE
+_CASTLING_KEEP[60] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+_CASTLING_KEEP[63] &= ~WHITE_KINGSIDE
+
+
+class UndoRecord(NamedTuple):
+    """State needed to take back a move made with ChessBoard.make_move."""
+    move: Move | int
+    captured: Optional["Piece"]
+    castling_rights: int
+    ep_square: Optional[int]
+    halfmove_clock: int
+    # Position key before the move, for repetition detection
+    position_key: int
+
+
+# All 12 pieces in bitboard order, so PIECES[piece.index] is piece
+PIECES = tuple(Piece(piece_type, color) for color in COLORS for piece_type in PIECE_TYPES)
+
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+# FEN letter of each piece, in PIECES order
+FEN_LETTERS = "PNBRQKpnbrqk"
+CASTLING_LETTERS = ((WHITE_KINGSIDE, "K"), (WHITE_QUEENSIDE, "Q"), (BLACK_KINGSIDE, "k"), (BLACK_QUEENSIDE, "q"))
+
+# Binary encoding: one nibble per square, 0 for empty and piece.index + 1 otherwise,
+# two squares per byte with the lower square index in the high nibble
+ENCODED_SIZE = 32
+_NIBBLE_PIECES: tuple[Optional[Piece], ...] = (None, *PIECES)
+
+
+# Material key: the count of each piece packed into 7 bits, at bit 7 * piece.index,
+# so adding or removing a piece is a single add or subtract
+MATERIAL_BITS = 7
+_MATERIAL_UNITS = tuple(1 << (MATERIAL_BITS * index) for index in range(12))
+_MATERIAL_MASK = (1 << MATERIAL_BITS) - 1
+# Signature letters from the most to the least valuable piece, as (index offset, letter)
+_SIGNATURE_ORDER = ((5, "K"), (4, "Q"), (3, "R"), (2, "B"), (1, "N"), (0, "P"))
+
+
+def material_key(bitboards) -> int:
+    """Pack the piece counts of 12 bitboards (PIECES order) into a material key."""
+    return sum(int(mask).bit_count() << (MATERIAL_BITS * index) for index, mask in enumerate(bitboards))
+
+
+@lru_cache(maxsize=4096)
+def material_signature(key: int) -> str:
+    """Return the signature of a material key, e.g. "KRPvKR"."""
+    sides = []
+    for base in (0, 6):
+        side = ""
+        for offset, letter in _SIGNATURE_ORDER:
+            side += letter * (key >> (MATERIAL_BITS * (base + offset)) & _MATERIAL_MASK)
+        sides.append(side)
+    return "v".join(sides)
+
+
+def _encode_rows(rows) -> bytes:
+    out = bytearray(ENCODED_SIZE)
+    i = 0
+    for row in rows:
+        for col in range(0, 8, 2):
+            high, low = row[col], row[col + 1]
+            out[i] = ((high.index + 1) << 4 if high else 0) | (low.index + 1 if low else 0)
+            i += 1
+    return bytes(out)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class BoardSnapshot:
+    """Immutable capture of a board's placement and game state.
+
+    Hashing and equality cover the placement only, like ChessBoard's. Rows are
+    shared with the board they were taken from; the board copies a row before
+    its first write after the snapshot, so taking and restoring a snapshot does
+    not copy the 8x8 grid.
+    """
+
+    rows: tuple[list[Optional[Piece]], ...]
+    bitboards: tuple[int, ...]
+    occupied_co: tuple[int, int]
+    zobrist_key: int
+    turn: PieceColor = PieceColor.WHITE
+    castling_rights: int = 0
+    ep_square: Optional[int] = None
+    halfmove_clock: int = 0
+    fullmove_number: int = 1
+
+    def __hash__(self) -> int:
+        return self.zobrist_key
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BoardSnapshot):
+            return NotImplemented
+        return self.zobrist_key == other.zobrist_key and self.bitboards == other.bitboards
+
+    def get_piece(self, row: int, col: int) -> Optional[Piece]:
+        """Get piece at position (row, col)."""
+        if 0 <= row < 8 and 0 <= col < 8:
+            return self.rows[row][col]
+        return None
+
+    def to_bytes(self) -> bytes:
+        """Encode the placement as 32 bytes, like ChessBoard.to_bytes()."""
+        return _encode_rows(self.rows)
+
+
+def _castling_rook_squares(king_to: int) -> tuple[int, int]:
+    # (rook from, rook to) for a castling king landing on king_to
+    if king_to & 7 == 6:
+        return king_to + 1, king_to - 1
+    return king_to - 2, king_to + 1
+
+
 class ChessBoard:
-    """Represents a chess board with customizable piece positions."""
+    """Represents a chess board with customizable piece positions.
+
+    Placement is kept in two views that are updated together: the 8x8 ``board``
+    grid for per-square access, and bitboards (one 64-bit mask per piece type and
+    color, plus occupancy masks) for set-wise queries. Bit ``row * 8 + col``
+    corresponds to ``board[row][col]``.
+
+    A Zobrist key of the placement is maintained alongside and used for hashing
+    and equality. Boards are mutable, so a board must not be changed while it is
+    used as a dict key or set member.
+
+    The material key packs the count of each piece (see ``material_key``) and is
+    maintained the same way, so material queries never scan the board.
+
+    Game state (side to move, castling rights, en-passant square and move
+    counters) lives next to the placement and is updated by ``make_move``;
+    ``unmake_move`` takes moves back from a stack of small undo records, which
+    also serve as the position-key history for repetition detection. The
+    Zobrist key and equality cover the placement only.
+
+    ``snapshot()``/``restore()`` share grid rows copy-on-write: ``_shared_rows``
+    has bit ``row`` set while that row list may also be referenced by a snapshot.
+    """
 
     def __init__(self):
         # 8x8 board, None represents empty square
         self.board: list[list[Optional[Piece]]] = [[None for _ in range(8)] for _ in range(8)]
+        self.bitboards: list[int] = [0] * 12
+        self.occupied_co: list[int] = [0, 0]
+        self.occupied: int = 0
+        self.zobrist_key: int = 0
+        self.material_key: int = 0
+        self._shared_rows: int = 0
+        self.turn: PieceColor = PieceColor.WHITE
+        self.castling_rights: int = 0
+        # Square skipped by the last double pawn push, when an enemy pawn could capture there
+        self.ep_square: Optional[int] = None
+        self.halfmove_clock: int = 0
+        self.fullmove_number: int = 1
+        self._undo_stack: list[UndoRecord] = []
+
+    @classmethod
+    def from_snapshot(cls, snapshot: BoardSnapshot) -> "ChessBoard":
+        """Create a board holding the placement of a snapshot."""
+        board = cls()
+        board.restore(snapshot)
+        return board
+
+    @classmethod
+    def from_bitboards(cls, bitboards) -> "ChessBoard":
+        """Create a board from 12 bitboards in PIECES order."""
+        board = cls()
+        for piece, mask in zip(PIECES, bitboards):
+            for square in iter_squares(int(mask)):
+                board._set_square(square, piece)
+        return board
+
+    @classmethod
+    def from_buffer(cls, buffer, offset: int = 0) -> "ChessBoard":
+        """Decode a board from 32 bytes of a bytes-like object, starting at offset.
+
+        The buffer is read in place, so a slice of a large bytes, memoryview or
+        mmap can be decoded without copying it first.
+        """
+        view = memoryview(buffer)
+        if len(view) - offset < ENCODED_SIZE:
+            raise ValueError(f"Need {ENCODED_SIZE} bytes to decode a board, got {len(view) - offset}")
+        board = cls()
+        square = 0
+        for byte in view[offset:offset + ENCODED_SIZE]:
+            high, low = byte >> 4, byte & 0xF
+            if high > 12 or low > 12:
+                raise ValueError(f"Invalid square code in byte {byte:#04x}")
+            if high:
+                board._set_square(square, _NIBBLE_PIECES[high])
+            if low:
+                board._set_square(square + 1, _NIBBLE_PIECES[low])
+            square += 2
+        return board
+
+    def to_bytes(self) -> bytes:
+        """Encode the placement as 32 bytes (one nibble per square)."""
+        return _encode_rows(self.board)
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "ChessBoard":
+        """Create a board from a FEN string.
+
+        Parsed positions are cached (see position.parse_fen), so repeated FENs
+        only cost a copy-on-write restore.
+        """
+        from chess_editor.position import parse_fen
+
+        return parse_fen(fen).to_board()
+
+    def to_fen(self) -> str:
+        """Serialize the placement and game state as a FEN string."""
+        ranks = []
+        for row in self.board:
+            rank = ""
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += FEN_LETTERS[piece.index]
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        turn = "w" if self.turn is PieceColor.WHITE else "b"
+        castling = "".join(letter for flag, letter in CASTLING_LETTERS if self.castling_rights & flag) or "-"
+        ep = "-" if self.ep_square is None else SQUARE_NAMES[self.ep_square]
+        return f"{'/'.join(ranks)} {turn} {castling} {ep} {self.halfmove_clock} {self.fullmove_number}"
+
+    def __hash__(self) -> int:
+        return self.zobrist_key
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChessBoard):
+            return NotImplemented
+        return self.zobrist_key == other.zobrist_key and self.bitboards == other.bitboards
 
     def get_piece(self, row: int, col: int) -> Optional[Piece]:
         """Get piece at position (row, col)."""
@@ -66,13 +402,53 @@ class ChessBoard:
     def set_piece(self, row: int, col: int, piece: Optional[Piece]) -> bool:
         """Set piece at position (row, col). Returns True if successful."""
         if 0 <= row < 8 and 0 <= col < 8:
-            self.board[row][col] = piece
+            self._set_square(row * 8 + col, piece)
             return True
         return False
 
     def clear(self):
         """Clear the entire board."""
         self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.bitboards = [0] * 12
+        self.occupied_co = [0, 0]
+        self.occupied = 0
+        self.zobrist_key = 0
+        self.material_key = 0
+        self._shared_rows = 0
+        self.turn = PieceColor.WHITE
+        self.castling_rights = 0
+        self.ep_square = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self._undo_stack = []
+
+    def snapshot(self) -> BoardSnapshot:
+        """Capture the current placement and game state without copying the grid."""
+        self._shared_rows = 0xFF
+        return BoardSnapshot(
+            tuple(self.board), tuple(self.bitboards), (self.occupied_co[0], self.occupied_co[1]), self.zobrist_key,
+            self.turn, self.castling_rights, self.ep_square, self.halfmove_clock, self.fullmove_number,
+        )
+
+    def restore(self, snapshot: BoardSnapshot):
+        """Return to a snapshot's placement and game state.
+
+        Moves made before the restore can no longer be taken back, and they no
+        longer count towards repetitions.
+        """
+        self.board = list(snapshot.rows)
+        self.bitboards = list(snapshot.bitboards)
+        self.occupied_co = list(snapshot.occupied_co)
+        self.occupied = snapshot.occupied_co[0] | snapshot.occupied_co[1]
+        self.zobrist_key = snapshot.zobrist_key
+        self.material_key = material_key(snapshot.bitboards)
+        self._shared_rows = 0xFF
+        self.turn = snapshot.turn
+        self.castling_rights = snapshot.castling_rights
+        self.ep_square = snapshot.ep_square
+        self.halfmove_clock = snapshot.halfmove_clock
+        self.fullmove_number = snapshot.fullmove_number
+        self._undo_stack = []
 
     def setup_standard_position(self):
         """Set up standard chess starting position."""
@@ -84,10 +460,178 @@ class ChessBoard:
             PieceType.KING, PieceType.BISHOP, PieceType.KNIGHT, PieceType.ROOK
         ]
         for col, piece_type in enumerate(back_row):
-            self.board[0][col] = Piece(piece_type, PieceColor.BLACK)
-            self.board[1][col] = Piece(PieceType.PAWN, PieceColor.BLACK)
+            self._set_square(col, Piece.of(piece_type, PieceColor.BLACK))
+            self._set_square(8 + col, Piece.of(PieceType.PAWN, PieceColor.BLACK))
 
         # White pieces (row 6, 7)
         for col, piece_type in enumerate(back_row):
-            self.board[7][col] = Piece(piece_type, PieceColor.WHITE)
-            self.board[6][col] = Piece(PieceType.PAWN, PieceColor.WHITE)
+            self._set_square(56 + col, Piece.of(piece_type, PieceColor.WHITE))
+            self._set_square(48 + col, Piece.of(PieceType.PAWN, PieceColor.WHITE))
+
+        self.castling_rights = ALL_CASTLING
+
+    def make_move(self, move: Move | int):
+        """Play a Move or packed move in place and push an undo record.
+
+        The move is not checked for legality.
+        """
+        if isinstance(move, int):
+            from_square, to_square, promotion = move & 63, move >> 6 & 63, PROMOTION_CODES[move >> 12]
+        else:
+            from_square, to_square, promotion = move
+        piece = self.piece_at(from_square)
+        if piece is None:
+            raise ValueError(f"No piece on square {from_square}")
+        captured = self.piece_at(to_square)
+        self._undo_stack.append(
+            UndoRecord(move, captured, self.castling_rights, self.ep_square, self.halfmove_clock, self.position_key)
+        )
+
+        color = piece.color
+        self._set_square(from_square, None)
+        ep_square = None
+        if piece.piece_type is PieceType.PAWN:
+            if to_square == self.ep_square:
+                self._set_square(to_square + (8 if color is PieceColor.WHITE else -8), None)
+            elif abs(to_square - from_square) == 16:
+                enemy_pawns = self.bitboards[piece.index + (6 if color is PieceColor.WHITE else -6)]
+                col = to_square & 7
+                adjacent = (1 << (to_square - 1) if col > 0 else 0) | (1 << (to_square + 1) if col < 7 else 0)
+                if enemy_pawns & adjacent:
+                    ep_square = (from_square + to_square) >> 1
+            if promotion is not None:
+                piece = Piece.of(promotion, color)
+            self.halfmove_clock = 0
+        elif captured is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if piece.piece_type is PieceType.KING and abs(to_square - from_square) == 2:
+            rook_from, rook_to = _castling_rook_squares(to_square)
+            self._set_square(rook_to, self.piece_at(rook_from))
+            self._set_square(rook_from, None)
+        self._set_square(to_square, piece)
+
+        self.ep_square = ep_square
+        self.castling_rights &= _CASTLING_KEEP[from_square] & _CASTLING_KEEP[to_square]
+        if color is PieceColor.BLACK:
+            self.fullmove_number += 1
+            self.turn = PieceColor.WHITE
+        else:
+            self.turn = PieceColor.BLACK
+
+    def unmake_move(self) -> Move | int:
+        """Take back the last move made with make_move and return it, in the form it was given."""
+        undo = self._undo_stack.pop()
+        move = undo.move
+        if isinstance(move, int):
+            from_square, to_square, promotion = move & 63, move >> 6 & 63, move >> 12
+        else:
+            from_square, to_square, promotion = move
+        piece = self.piece_at(to_square)
+        color = piece.color
+        if promotion:
+            piece = Piece.of(PieceType.PAWN, color)
+
+        self._set_square(to_square, undo.captured)
+        self._set_square(from_square, piece)
+        if piece.piece_type is PieceType.PAWN and to_square == undo.ep_square:
+            enemy = PieceColor.BLACK if color is PieceColor.WHITE else PieceColor.WHITE
+            self._set_square(
+                to_square + (8 if color is PieceColor.WHITE else -8), Piece.of(PieceType.PAWN, enemy)
+            )
+        elif piece.piece_type is PieceType.KING and abs(to_square - from_square) == 2:
+            rook_from, rook_to = _castling_rook_squares(to_square)
+            self._set_square(rook_from, self.piece_at(rook_to))
+            self._set_square(rook_to, None)
+
+        self.castling_rights = undo.castling_rights
+        self.ep_square = undo.ep_square
+        self.halfmove_clock = undo.halfmove_clock
+        if color is PieceColor.BLACK:
+            self.fullmove_number -= 1
+        self.turn = color
+        return move
+
+    @property
+    def position_key(self) -> int:
+        """Zobrist key of the placement combined with side to move, castling and en passant."""
+        return self.zobrist_key ^ state_key(
+            self.turn is PieceColor.BLACK, self.castling_rights, self.ep_square
+        )
+
+    def is_repetition(self, count: int = 3) -> bool:
+        """True if the current position has occurred count times in the moves made on this board.
+
+        Only positions since the last capture or pawn move can repeat, so just
+        that window of the undo stack is scanned, every other ply.
+        """
+        key = self.position_key
+        stack = self._undo_stack
+        start = max(len(stack) - self.halfmove_clock, 0)
+        seen = 1
+        for i in range(len(stack) - 2, start - 1, -2):
+            if stack[i].position_key == key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def is_fifty_moves(self) -> bool:
+        """True if fifty moves by each side have passed without a capture or pawn move."""
+        return self.halfmove_clock >= 100
+
+    def piece_at(self, square: int) -> Optional[Piece]:
+        """Get piece at a square index (row * 8 + col)."""
+        return self.board[square >> 3][square & 7]
+
+    def pieces_mask(self, piece_type: PieceType, color: PieceColor) -> int:
+        """Bitboard of all pieces of the given type and color."""
+        return self.bitboards[PIECE_INDEX[(color, piece_type)]]
+
+    def color_mask(self, color: PieceColor) -> int:
+        """Bitboard of all pieces of the given color."""
+        return self.occupied_co[0 if color is PieceColor.WHITE else 1]
+
+    def count(self, piece_type: PieceType, color: PieceColor) -> int:
+        """Number of pieces of the given type and color on the board."""
+        return self.material_key >> (MATERIAL_BITS * PIECE_INDEX[(color, piece_type)]) & _MATERIAL_MASK
+
+    def piece_counts(self) -> tuple[int, ...]:
+        """Number of pieces of each kind, in PIECES order."""
+        key = self.material_key
+        return tuple(key >> (MATERIAL_BITS * index) & _MATERIAL_MASK for index in range(12))
+
+    @property
+    def material_signature(self) -> str:
+        """Material signature such as "KRPvKR", white first."""
+        return material_signature(self.material_key)
+
+    def king_square(self, color: PieceColor) -> Optional[int]:
+        """Square index of the given side's king, or None if it has no king."""
+        mask = self.pieces_mask(PieceType.KING, color)
+        return next(iter_squares(mask), None)
+
+    def _set_square(self, square: int, piece: Optional[Piece]):
+        r = square >> 3
+        if self._shared_rows >> r & 1:
+            self.board[r] = self.board[r].copy()
+            self._shared_rows &= ~(1 << r)
+        row = self.board[r]
+        bit = 1 << square
+        old = row[square & 7]
+        if old is not None:
+            index = old.index
+            self.bitboards[index] ^= bit
+            self.occupied_co[index // 6] ^= bit
+            self.occupied ^= bit
+            self.zobrist_key ^= PIECE_SQUARE_KEYS[index][square]
+            self.material_key -= _MATERIAL_UNITS[index]
+        if piece is not None:
+            index = piece.index
+            self.bitboards[index] |= bit
+            self.occupied_co[index // 6] |= bit
+            self.occupied |= bit
+            self.zobrist_key ^= PIECE_SQUARE_KEYS[index][square]
+            self.material_key += _MATERIAL_UNITS[index]
+        row[square & 7] = piece
@@ -0,0 +1,140 @@
+"""Bulk loading of FEN and EPD position files.
+
+Files are read as a stream of line chunks. Chunks are parsed in worker
+processes, which send back packed Position.to_bytes() records rather than
+pickled objects, and results are consumed in file order. Only a bounded number
+of chunks is in flight at a time, so memory use does not grow with file size.
+"""
+
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from chess_editor.batch import BoardBatch
+from chess_editor.position import POSITION_SIZE, Position, read_fen
+
+DEFAULT_CHUNK_LINES = 20_000
+
+
+def parse_line(line: str) -> Optional[Position]:
+    """Parse one FEN or EPD line; returns None for blank and comment lines.
+
+    Up to two numeric fields after the four position fields are read as the
+    move counters, which default to 0 and 1 when absent; EPD operations are
+    ignored.
+    """
+    fields = line.split(None, 6)
+    if not fields or fields[0].startswith("#"):
+        return None
+    end = 4
+    while end < min(len(fields), 6) and fields[end].isdigit():
+        end += 1
+    return read_fen(" ".join(fields[:end]))
+
+
+def _parse_chunk(data: bytes, first_line: int, skip_invalid: bool) -> bytes:
+    out = bytearray()
+    # Lines are decoded one at a time, so a bad byte only invalidates its own line
+    for number, line in enumerate(data.split(b"\n"), first_line):
+        try:
+            position = parse_line(line.decode())
+        except ValueError as error:
+            if skip_invalid:
+                continue
+            raise ValueError(f"Line {number}: {error}") from None
+        if position is not None:
+            out += position.to_bytes()
+    return bytes(out)
+
+
+def _chunks(path: Path, chunk_lines: int) -> Iterator[tuple[bytes, int]]:
+    with path.open("rb") as file:
+        first_line = 1
+        while lines := list(islice(file, chunk_lines)):
+            yield b"".join(lines), first_line
+            first_line += len(lines)
+
+
+def iter_records(
+    path: str | Path,
+    jobs: Optional[int] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    skip_invalid: bool = False,
+) -> Iterator[bytes]:
+    """Yield each chunk's packed position records, in file order.
+
+    jobs defaults to the CPU count; with jobs=1 everything is parsed in this
+    process. Invalid lines raise ValueError unless skip_invalid is set.
+    """
+    chunks = _chunks(Path(path), chunk_lines)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for data, first_line in chunks:
+            yield _parse_chunk(data, first_line, skip_invalid)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: deque[Future] = deque()
+        for data, first_line in chunks:
+            pending.append(pool.submit(_parse_chunk, data, first_line, skip_invalid))
+            # Keep every worker busy plus one queued chunk each, and no more
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_positions(
+    path: str | Path,
+    jobs: Optional[int] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    skip_invalid: bool = False,
+) -> Iterator[Position]:
+    """Yield every position in a FEN/EPD file, in file order."""
+    for records in iter_records(path, jobs, chunk_lines, skip_invalid):
+        for offset in range(0, len(records), POSITION_SIZE):
+            yield Position.from_buffer(records, offset)
+
+
+def load_into(
+    path: str | Path,
+    bitboards: np.ndarray,
+    states: np.ndarray,
+    jobs: Optional[int] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    skip_invalid: bool = False,
+) -> int:
+    """Fill preallocated (N, 12) bitboard and (N,) state arrays from a FEN/EPD file.
+
+    Returns the number of positions written. Raises ValueError if the file
+    holds more positions than the arrays have rows.
+    """
+    count = 0
+    for records in iter_records(path, jobs, chunk_lines, skip_invalid):
+        if not records:
+            continue
+        batch = BoardBatch.from_position_buffer(records)
+        end = count + len(batch)
+        if end > len(bitboards) or end > len(states):
+            raise ValueError(f"File has more than {min(len(bitboards), len(states))} positions")
+        bitboards[count:end] = batch.bitboards
+        states[count:end] = batch.states
+        count = end
+    return count
+
+
+def load_batch(
+    path: str | Path,
+    jobs: Optional[int] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    skip_invalid: bool = False,
+) -> BoardBatch:
+    """Load a whole FEN/EPD file into a BoardBatch with states."""
+    records = b"".join(iter_records(path, jobs, chunk_lines, skip_invalid))
+    return BoardBatch.from_position_buffer(records)
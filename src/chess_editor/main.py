@@ -1,12 +1,16 @@
 """Main entry point for the chess board editor."""
 
+import argparse
+import time
+
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.layout import Layout
 from rich.text import Text
 
-from chess_editor.board import ChessBoard, Piece, PieceType, PieceColor
+from chess_editor.board import STARTING_FEN, ChessBoard, Piece, PieceType, PieceColor
+from chess_editor.perft import divide, parallel_divide, parallel_perft, perft
 
 
 class ChessBoardRenderer:
@@ -69,10 +73,8 @@ class ChessBoardRenderer:
         self.console.print(panel)
 
 
-def main():
-    """Main function to run the chess board editor."""
-    console = Console()
-
+def show_board(console: Console):
+    """Render the standard starting position."""
     # Create a board with standard starting position
     board = ChessBoard()
     board.setup_standard_position()
@@ -87,5 +89,56 @@ def main():
     console.print("[dim]Future features: interactive editing, save/load, custom positions[/dim]\n")
 
 
+def run_perft(console: Console, args: argparse.Namespace):
+    """Run perft and report nodes per second."""
+    try:
+        board = ChessBoard.from_fen(args.fen)
+    except ValueError as error:
+        console.print(f"[red]{error}[/red]")
+        raise SystemExit(2)
+    table = None if args.no_hash else {}
+
+    start = time.perf_counter()
+    if args.divide:
+        if args.jobs > 1:
+            results = parallel_divide(board, args.depth, args.jobs, not args.no_hash)
+        else:
+            results = divide(board, args.depth, table)
+        for move, count in sorted(results, key=lambda item: item[0].uci()):
+            console.print(f"{move.uci()}: {count}")
+        nodes = sum(count for _, count in results)
+        console.print(f"\nMoves: {len(results)}")
+    elif args.jobs > 1:
+        nodes = parallel_perft(board, args.depth, args.jobs, not args.no_hash)
+    else:
+        nodes = perft(board, args.depth, table)
+    elapsed = time.perf_counter() - start
+
+    console.print(f"Nodes: [bold]{nodes}[/bold]")
+    console.print(f"Time: {elapsed:.3f}s ({nodes / elapsed if elapsed else 0:,.0f} nodes/s)")
+
+
+def main():
+    """Main function to run the chess board editor."""
+    parser = argparse.ArgumentParser(prog="chess-editor", description="Terminal chess board editor")
+    commands = parser.add_subparsers(dest="command")
+
+    perft_parser = commands.add_parser("perft", help="count leaf nodes of the legal move tree")
+    perft_parser.add_argument("depth", type=int, help="search depth in plies")
+    perft_parser.add_argument("--fen", default=STARTING_FEN, help="position to start from (default: initial position)")
+    perft_parser.add_argument("--divide", action="store_true", help="show the node count below each root move")
+    perft_parser.add_argument("--no-hash", action="store_true", help="disable the transposition table")
+    perft_parser.add_argument(
+        "--jobs", "-j", type=int, default=1, help="worker processes to split the search across"
+    )
+
+    args = parser.parse_args()
+    console = Console()
+    if args.command == "perft":
+        run_perft(console, args)
+    else:
+        show_board(console)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,281 @@
+"""Legal move generation.
+
+Moves are generated legal directly: the checkers, the check evasion mask and
+the pinned pieces are computed once per position, and every candidate target
+set is intersected with them instead of trying each move and testing for check.
+"""
+
+from array import array
+from typing import Optional
+
+from chess_editor.attacks import attack_tables, piece_attacks, slider_tables
+from chess_editor.board import (
+    BLACK_KINGSIDE, BLACK_QUEENSIDE, WHITE_KINGSIDE, WHITE_QUEENSIDE,
+    ChessBoard, Move, PieceColor, PieceType, pack_move,
+)
+from chess_editor.utils.bitboard import FULL, iter_squares, lsb
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PROMOTIONS = (PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT)
+_PROMOTION_BITS = tuple(pack_move(0, 0, promotion) for promotion in PROMOTIONS)
+
+# (right, king from, king to, rook from, squares that must be empty, squares the king crosses)
+_CASTLES = {
+    PieceColor.WHITE: (
+        (WHITE_KINGSIDE, 60, 62, 63, (1 << 61) | (1 << 62), (61, 62)),
+        (WHITE_QUEENSIDE, 60, 58, 56, (1 << 57) | (1 << 58) | (1 << 59), (59, 58)),
+    ),
+    PieceColor.BLACK: (
+        (BLACK_KINGSIDE, 4, 6, 7, (1 << 5) | (1 << 6), (5, 6)),
+        (BLACK_QUEENSIDE, 4, 2, 0, (1 << 1) | (1 << 2) | (1 << 3), (3, 2)),
+    ),
+}
+
+
+def _color_index(color: PieceColor) -> int:
+    return 0 if color is PieceColor.WHITE else 1
+
+
+def attackers_to(board: ChessBoard, square: int, color: PieceColor, occupied: Optional[int] = None) -> int:
+    """Bitboard of color's pieces attacking square, treating occupied as the blockers."""
+    if occupied is None:
+        occupied = board.occupied
+    tables = attack_tables()
+    sliders = slider_tables()
+    us = _color_index(color)
+    base = us * 6
+    bb = board.bitboards
+    queens = bb[base + QUEEN]
+    diagonal = sliders.bishop[square][occupied & sliders.bishop_masks[square]]
+    straight = sliders.rook[square][occupied & sliders.rook_masks[square]]
+    return (
+        # A pawn of ours attacks square exactly when a pawn of theirs on square would attack it
+        (tables.pawn[us ^ 1][square] & bb[base + PAWN])
+        | (tables.knight[square] & bb[base + KNIGHT])
+        | (tables.king[square] & bb[base + KING])
+        | (diagonal & (bb[base + BISHOP] | queens))
+        | (straight & (bb[base + ROOK] | queens))
+    )
+
+
+def is_attacked(board: ChessBoard, square: int, color: PieceColor) -> bool:
+    """True if any of color's pieces attacks square."""
+    return attackers_to(board, square, color) != 0
+
+
+def checkers(board: ChessBoard, color: PieceColor) -> int:
+    """Bitboard of pieces giving check to color's king (0 if it has no king)."""
+    king = board.pieces_mask(PieceType.KING, color)
+    if not king:
+        return 0
+    return attackers_to(board, lsb(king), _opponent(color))
+
+
+def is_check(board: ChessBoard, color: PieceColor) -> bool:
+    """True if color's king is attacked."""
+    return checkers(board, color) != 0
+
+
+def _opponent(color: PieceColor) -> PieceColor:
+    return PieceColor.BLACK if color is PieceColor.WHITE else PieceColor.WHITE
+
+
+def _pinned(board: ChessBoard, king: int, us: int, occupied: int) -> int:
+    # Our pieces that are the only blocker between our king and an enemy slider
+    tables = attack_tables()
+    sliders = slider_tables()
+    bb = board.bitboards
+    them = (us ^ 1) * 6
+    queens = bb[them + QUEEN]
+    snipers = (
+        (sliders.rook[king][0] & (bb[them + ROOK] | queens))
+        | (sliders.bishop[king][0] & (bb[them + BISHOP] | queens))
+    )
+    ours = board.occupied_co[us]
+    pinned = 0
+    for sniper in iter_squares(snipers):
+        blockers = tables.between[king][sniper] & occupied
+        if blockers and blockers & (blockers - 1) == 0 and blockers & ours:
+            pinned |= blockers
+    return pinned
+
+
+def legal_moves(board: ChessBoard) -> list[Move]:
+    """Every legal move for the board's side to move, as Move tuples."""
+    return [Move.unpack(move) for move in generate_moves(board)]
+
+
+def generate_moves(board: ChessBoard, out: Optional[array] = None) -> array:
+    """Generate every legal move for the board's side to move as packed 16-bit moves.
+
+    Moves are written into out (an ``array("H")``, cleared first) when given, so
+    callers can reuse one buffer per ply. Positions without a king for the side
+    to move are treated as never in check.
+    """
+    if out is None:
+        out = array("H")
+    else:
+        del out[:]
+    turn = board.turn
+    castling_rights = board.castling_rights
+    ep_square = board.ep_square
+    tables = attack_tables()
+    sliders = slider_tables()
+    between = tables.between
+    line = tables.line
+    rook_table, rook_masks = sliders.rook, sliders.rook_masks
+    bishop_table, bishop_masks = sliders.bishop, sliders.bishop_masks
+
+    us = _color_index(turn)
+    them_color = _opponent(turn)
+    bb = board.bitboards
+    base = us * 6
+    ours = board.occupied_co[us]
+    theirs = board.occupied_co[us ^ 1]
+    occupied = board.occupied
+    append = out.append
+
+    king_mask = bb[base + KING]
+    if king_mask:
+        king = lsb(king_mask)
+        checking = attackers_to(board, king, them_color)
+        # King moves: the destination must not be attacked once the king has left its square
+        without_king = occupied ^ king_mask
+        for target in iter_squares(tables.king[king] & ~ours):
+            if not attackers_to(board, target, them_color, without_king):
+                append(king | target << 6)
+        if checking & (checking - 1):
+            return out
+        if checking:
+            evasion = checking | between[king][lsb(checking)]
+        else:
+            evasion = FULL
+        pinned = _pinned(board, king, us, occupied)
+    else:
+        king = -1
+        checking = 0
+        evasion = FULL
+        pinned = 0
+
+    def allowed(square: int, targets: int) -> int:
+        targets &= evasion
+        if pinned >> square & 1:
+            targets &= line[king][square]
+        return targets
+
+    # Knights (a pinned knight can never move)
+    for square in iter_squares(bb[base + KNIGHT] & ~pinned):
+        for target in iter_squares(tables.knight[square] & ~ours & evasion):
+            append(square | target << 6)
+
+    queens = bb[base + QUEEN]
+    for square in iter_squares(bb[base + BISHOP] | queens):
+        attacks = bishop_table[square][occupied & bishop_masks[square]]
+        for target in iter_squares(allowed(square, attacks & ~ours)):
+            append(square | target << 6)
+    for square in iter_squares(bb[base + ROOK] | queens):
+        attacks = rook_table[square][occupied & rook_masks[square]]
+        for target in iter_squares(allowed(square, attacks & ~ours)):
+            append(square | target << 6)
+
+    # Pawns: white moves toward row 0
+    step = -8 if us == 0 else 8
+    start_row = 6 if us == 0 else 1
+    last_row = 0 if us == 0 else 7
+    for square in iter_squares(bb[base + PAWN]):
+        targets = tables.pawn[us][square] & theirs
+        one = square + step
+        if 0 <= one < 64 and not occupied >> one & 1:
+            targets |= 1 << one
+            two = one + step
+            if square >> 3 == start_row and not occupied >> two & 1:
+                targets |= 1 << two
+        for target in iter_squares(allowed(square, targets)):
+            if target >> 3 == last_row:
+                move = square | target << 6
+                for promotion in _PROMOTION_BITS:
+                    append(move | promotion)
+            else:
+                append(square | target << 6)
+
+    if ep_square is not None:
+        captured = ep_square - step
+        for square in iter_squares(tables.pawn[us ^ 1][ep_square] & bb[base + PAWN]):
+            if king < 0:
+                append(square | ep_square << 6)
+                continue
+            # Rare enough to verify directly: remove both pawns, add ours on ep_square
+            after = occupied ^ (1 << square) ^ (1 << captured) | (1 << ep_square)
+            them = (us ^ 1) * 6
+            queens_them = bb[them + QUEEN]
+            exposed = (
+                (rook_table[king][after & rook_masks[king]] & (bb[them + ROOK] | queens_them))
+                | (bishop_table[king][after & bishop_masks[king]] & (bb[them + BISHOP] | queens_them))
+                | (tables.knight[king] & bb[them + KNIGHT])
+                | (tables.pawn[us][king] & bb[them + PAWN] & ~(1 << captured))
+            )
+            if not exposed:
+                append(square | ep_square << 6)
+
+    if castling_rights and king >= 0 and not checking:
+        rook_piece = base + ROOK
+        for right, king_from, king_to, rook_from, empty, crossed in _CASTLES[turn]:
+            if (
+                castling_rights & right
+                and king == king_from
+                and bb[rook_piece] >> rook_from & 1
+                and not occupied & empty
+                and not any(attackers_to(board, sq, them_color) for sq in crossed)
+            ):
+                append(king_from | king_to << 6)
+
+    return out
+
+
+def is_legal(board: ChessBoard, move: Move) -> bool:
+    """True if move is legal for the side to move.
+
+    Pseudo-legality is checked against the moving piece's attack mask, and king
+    safety by playing the move and taking it back, so this costs far less than
+    generating every legal move. Castling, which is rare, is checked against
+    the full move list.
+    """
+    piece = board.piece_at(move.from_square)
+    if piece is None or piece.color is not board.turn:
+        return False
+    from_square, to_square = move.from_square, move.to_square
+    target = board.piece_at(to_square)
+    if target is not None and target.color is board.turn:
+        return False
+
+    piece_type = piece.piece_type
+    if piece_type is PieceType.PAWN:
+        us = _color_index(piece.color)
+        step = -8 if us == 0 else 8
+        last_row = 0 if us == 0 else 7
+        if (to_square >> 3 == last_row) != (move.promotion in PROMOTIONS):
+            return False
+        if to_square == from_square + step:
+            if target is not None:
+                return False
+        elif to_square == from_square + 2 * step:
+            if from_square >> 3 != (6 if us == 0 else 1) or target is not None:
+                return False
+            if board.piece_at(from_square + step) is not None:
+                return False
+        elif attack_tables().pawn[us][from_square] >> to_square & 1:
+            if target is None and to_square != board.ep_square:
+                return False
+        else:
+            return False
+    elif move.promotion is not None:
+        return False
+    elif piece_type is PieceType.KING and abs(to_square - from_square) == 2:
+        return move.pack() in generate_moves(board)
+    elif not piece_attacks(piece_type, piece.color, from_square, board.occupied) >> to_square & 1:
+        return False
+
+    board.make_move(move)
+    legal = not is_check(board, piece.color)
+    board.unmake_move()
+    return legal
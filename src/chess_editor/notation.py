@@ -0,0 +1,150 @@
+"""SAN and UCI move notation.
+
+Square names and piece letters come from lookup tables, and SAN
+disambiguation is worked out from attack masks: the pieces that could reach
+the destination are those of the moving type found in that type's attack set
+from the destination square. Neither direction generates the full move list,
+except to tell check from checkmate when writing SAN.
+"""
+
+import re
+
+from chess_editor.attacks import attack_tables, piece_attacks
+from chess_editor.board import ChessBoard, Move, PieceColor, PieceType
+from chess_editor.movegen import is_check, is_legal, legal_moves
+from chess_editor.utils.bitboard import SQUARE_INDEX, SQUARE_NAMES, iter_squares
+
+SAN_LETTERS = {
+    PieceType.KING: "K", PieceType.QUEEN: "Q", PieceType.ROOK: "R",
+    PieceType.BISHOP: "B", PieceType.KNIGHT: "N",
+}
+_SAN_PIECES = {letter: piece_type for piece_type, letter in SAN_LETTERS.items()}
+_UCI_PROMOTIONS = {"q": PieceType.QUEEN, "r": PieceType.ROOK, "b": PieceType.BISHOP, "n": PieceType.KNIGHT}
+_FILE_MASKS = {"abcdefgh"[col]: sum(1 << (row * 8 + col) for row in range(8)) for col in range(8)}
+_RANK_MASKS = {str(8 - row): 0xFF << (row * 8) for row in range(8)}
+
+_SAN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+_CASTLING_SAN = {"O-O": 6, "0-0": 6, "O-O-O": 2, "0-0-0": 2}
+
+
+def parse_uci(board: ChessBoard, text: str) -> Move:
+    """Parse a UCI move such as "e2e4" or "e7e8q"; raises ValueError if illegal."""
+    from_square = SQUARE_INDEX.get(text[0:2])
+    to_square = SQUARE_INDEX.get(text[2:4])
+    promotion = _UCI_PROMOTIONS.get(text[4:]) if len(text) == 5 else None
+    if from_square is None or to_square is None or len(text) not in (4, 5) or (len(text) == 5 and not promotion):
+        raise ValueError(f"Invalid UCI move: {text!r}")
+    move = Move(from_square, to_square, promotion)
+    if not is_legal(board, move):
+        raise ValueError(f"Illegal move: {text!r}")
+    return move
+
+
+def move_to_uci(move: Move) -> str:
+    """Format a move in UCI notation."""
+    return move.uci()
+
+
+def _candidates(board: ChessBoard, piece_type: PieceType, to_square: int) -> int:
+    # Pieces of the side to move and the given type that attack to_square
+    color = board.turn
+    attacks = piece_attacks(piece_type, color, to_square, board.occupied)
+    return attacks & board.pieces_mask(piece_type, color)
+
+
+def parse_san(board: ChessBoard, text: str) -> Move:
+    """Parse a SAN move such as "Nbd7", "exd6", "e8=Q+" or "O-O"; raises ValueError if illegal or ambiguous."""
+    san = text.rstrip("+#!?")
+    color = board.turn
+    back_row = 7 if color is PieceColor.WHITE else 0
+
+    castle_col = _CASTLING_SAN.get(san)
+    if castle_col is not None:
+        move = Move(back_row * 8 + 4, back_row * 8 + castle_col)
+        if not is_legal(board, move):
+            raise ValueError(f"Illegal move: {text!r}")
+        return move
+
+    match = _SAN.match(san)
+    if match is None:
+        raise ValueError(f"Invalid SAN move: {text!r}")
+    letter, file, rank, destination, promotion_letter = match.groups()
+    to_square = SQUARE_INDEX[destination]
+    promotion = _SAN_PIECES[promotion_letter] if promotion_letter else None
+
+    if letter:
+        piece_type = _SAN_PIECES[letter]
+        candidates = _candidates(board, piece_type, to_square)
+    else:
+        piece_type = PieceType.PAWN
+        pawns = board.pieces_mask(PieceType.PAWN, color)
+        if file and file != destination[0]:
+            opponent = PieceColor.BLACK if color is PieceColor.WHITE else PieceColor.WHITE
+            candidates = attack_tables().pawn[0 if opponent is PieceColor.WHITE else 1][to_square] & pawns
+        else:
+            # A push: the nearest pawn behind the destination on its file
+            step = 8 if color is PieceColor.WHITE else -8
+            behind = to_square + step
+            candidates = 0
+            if 0 <= behind < 64:
+                if pawns >> behind & 1:
+                    candidates = 1 << behind
+                elif board.piece_at(behind) is None and 0 <= behind + step < 64:
+                    candidates = pawns & (1 << (behind + step))
+    if file:
+        candidates &= _FILE_MASKS[file]
+    if rank:
+        candidates &= _RANK_MASKS[rank]
+
+    moves = [
+        move for move in (Move(square, to_square, promotion) for square in iter_squares(candidates))
+        if is_legal(board, move)
+    ]
+    if not moves:
+        raise ValueError(f"Illegal move: {text!r}")
+    if len(moves) > 1:
+        raise ValueError(f"Ambiguous move: {text!r}")
+    return moves[0]
+
+
+def move_to_san(board: ChessBoard, move: Move) -> str:
+    """Format a legal move in SAN, including the check or mate suffix."""
+    piece = board.piece_at(move.from_square)
+    if piece is None:
+        raise ValueError(f"No piece on square {SQUARE_NAMES[move.from_square]}")
+    to_square = move.to_square
+    piece_type = piece.piece_type
+
+    if piece_type is PieceType.KING and abs(to_square - move.from_square) == 2:
+        san = "O-O" if to_square & 7 == 6 else "O-O-O"
+    elif piece_type is PieceType.PAWN:
+        san = ""
+        if move.from_square & 7 != to_square & 7:
+            san = SQUARE_NAMES[move.from_square][0] + "x"
+        san += SQUARE_NAMES[to_square]
+        if move.promotion:
+            san += "=" + SAN_LETTERS[move.promotion]
+    else:
+        san = SAN_LETTERS[piece_type]
+        others = [
+            square
+            for square in iter_squares(_candidates(board, piece_type, to_square) & ~(1 << move.from_square))
+            if is_legal(board, Move(square, to_square))
+        ]
+        if others:
+            from_name = SQUARE_NAMES[move.from_square]
+            if all(square & 7 != move.from_square & 7 for square in others):
+                san += from_name[0]
+            elif all(square >> 3 != move.from_square >> 3 for square in others):
+                san += from_name[1]
+            else:
+                san += from_name
+        if board.piece_at(to_square) is not None:
+            san += "x"
+        san += SQUARE_NAMES[to_square]
+
+    board.make_move(move)
+    if is_check(board, board.turn):
+        san += "#" if not legal_moves(board) else "+"
+    board.unmake_move()
+    return san
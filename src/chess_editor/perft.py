@@ -0,0 +1,119 @@
+"""Perft: counting the leaf nodes of the legal move tree.
+
+Used as a correctness check for move generation (the counts for well-known
+positions are published) and as a throughput benchmark for the board model.
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from chess_editor.board import ChessBoard, Move
+from chess_editor.movegen import generate_moves, legal_moves
+from chess_editor.position import Position
+
+# Transposition entries kept before the table stops accepting new ones
+MAX_TABLE_ENTRIES = 1 << 20
+# parallel_divide splits one ply deeper when there are fewer root moves than this per worker
+MIN_TASKS_PER_WORKER = 4
+
+
+def perft(board: ChessBoard, depth: int, table: Optional[dict[int, int]] = None) -> int:
+    """Count leaf nodes depth plies below the board's position.
+
+    The last ply is bulk counted from the length of the move list. When table
+    is given it caches subtree counts by position key and depth, so transposed
+    positions are only searched once; it can be reused across calls.
+    """
+    if depth <= 0:
+        return 1
+    # One packed move buffer per ply, reused across the whole search
+    return _perft(board, depth, table, [array("H") for _ in range(depth + 1)])
+
+
+def _perft(board: ChessBoard, depth: int, table: Optional[dict[int, int]], buffers: list[array]) -> int:
+    if depth == 1:
+        return len(generate_moves(board, buffers[1]))
+
+    if table is not None:
+        # Depth fits in the low 6 bits, the 64-bit position key above it
+        entry = board.position_key << 6 | depth
+        cached = table.get(entry)
+        if cached is not None:
+            return cached
+
+    # Moves are only generated on a table miss
+    moves = generate_moves(board, buffers[depth])
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += _perft(board, depth - 1, table, buffers)
+        board.unmake_move()
+
+    if table is not None and len(table) < MAX_TABLE_ENTRIES:
+        table[entry] = nodes
+    return nodes
+
+
+def divide(board: ChessBoard, depth: int, table: Optional[dict[int, int]] = None) -> list[tuple[Move, int]]:
+    """Perft split by root move: the leaf count below each legal move."""
+    results = []
+    for move in legal_moves(board):
+        board.make_move(move)
+        results.append((move, perft(board, depth - 1, table)))
+        board.unmake_move()
+    return results
+
+
+# Per-process transposition table shared by all tasks a pool worker runs
+_worker_table: Optional[dict[int, int]] = None
+
+
+def _init_worker(use_hash: bool):
+    global _worker_table
+    _worker_table = {} if use_hash else None
+
+
+def _perft_task(encoded: bytes, depth: int) -> int:
+    return perft(Position.from_buffer(encoded).to_board(), depth, _worker_table)
+
+
+def parallel_divide(board: ChessBoard, depth: int, jobs: int, use_hash: bool = True) -> list[tuple[Move, int]]:
+    """divide() with the subtrees spread over a pool of worker processes.
+
+    Each task is the position after a root move as a compact encoding. When
+    there are too few root moves to keep every worker busy, tasks start after
+    each root move and reply instead. Workers keep their own transposition
+    table across the tasks they are given.
+    """
+    moves = legal_moves(board)
+    if depth <= 1:
+        return [(move, 1) for move in moves]
+    split = depth > 2 and len(moves) < MIN_TASKS_PER_WORKER * jobs
+    # (root move index, encoded position) for every task
+    tasks = []
+    for index, move in enumerate(moves):
+        board.make_move(move)
+        if split:
+            for reply in generate_moves(board):
+                board.make_move(reply)
+                tasks.append((index, Position.from_board(board).to_bytes()))
+                board.unmake_move()
+        else:
+            tasks.append((index, Position.from_board(board).to_bytes()))
+        board.unmake_move()
+
+    task_depth = depth - 2 if split else depth - 1
+    counts = [0] * len(moves)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(use_hash,)) as pool:
+        futures = [pool.submit(_perft_task, position, task_depth) for _, position in tasks]
+        for (index, _), future in zip(tasks, futures):
+            counts[index] += future.result()
+    return list(zip(moves, counts))
+
+
+def parallel_perft(board: ChessBoard, depth: int, jobs: int, use_hash: bool = True) -> int:
+    """perft() with the subtrees spread over a pool of worker processes (see parallel_divide)."""
+    if depth <= 1:
+        return perft(board, depth)
+    return sum(count for _, count in parallel_divide(board, depth, jobs, use_hash))
@@ -0,0 +1,310 @@
+"""Streaming PGN reader.
+
+The file is memory-mapped and games are located with byte searches: a game is
+a block of tag lines (starting with ``[``) followed by movetext, and the next
+game begins at the next line that starts with ``[``, unless that line sits
+inside a ``{...}`` comment without a blank line before it. Only the bytes of
+the game being yielded are decoded, so memory use does not depend on file size.
+"""
+
+import mmap
+import os
+import re
+import struct
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+_TAG = re.compile(rb'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# Brace comments (possibly still open) and rest-of-line comments; neither nests
+# and each hides the other's opening character
+_COMMENT = re.compile(rb"\{[^}]*\}?|;[^\n]*")
+# Optional UTF-8 byte-order mark and whitespace before the first game
+_LEADING = re.compile(rb"(?:\xef\xbb\xbf)?\s*")
+
+
+class PgnGame(NamedTuple):
+    """One game: its byte offset in the file, tag pairs and movetext (whitespace collapsed)."""
+    offset: int
+    headers: dict[str, str]
+    movetext: str
+
+
+def _decode(data) -> str:
+    return str(data, "utf-8", errors="replace")
+
+
+def _tag_value(data) -> str:
+    return _decode(data).replace('\\"', '"').replace("\\\\", "\\")
+
+
+def _after_blank_line(buffer, start: int, newline: int) -> bool:
+    # Whether the line ending at newline is empty or whitespace only
+    previous = buffer.rfind(b"\n", start, newline)
+    return not buffer[previous + 1 if previous >= 0 else start:newline].strip()
+
+
+def _in_comment(buffer, start: int, pos: int) -> bool:
+    # pos is inside a brace comment when the last comment before it is a "{" still open at pos
+    last = None
+    for last in _COMMENT.finditer(buffer, start, pos):
+        pass
+    return last is not None and last.end() == pos and buffer[last.start()] == ord("{") and buffer[pos - 1] != ord("}")
+
+
+def _next_game_start(buffer, start: int, pos: int) -> int:
+    # Offset of the first line at or after pos that starts a game, or -1. Lines
+    # starting with "[" inside a comment (e.g. a wrapped [%clk ...]) do not,
+    # unless they follow a blank line
+    while True:
+        newline = buffer.find(b"\n[", pos)
+        if newline < 0:
+            return -1
+        if _after_blank_line(buffer, start, newline) or not _in_comment(buffer, start, newline):
+            return newline + 1
+        pos = newline + 1
+
+
+def find_game_end(buffer, start: int) -> tuple[int, int]:
+    """Return (movetext start, game end) for the game whose tags begin at start."""
+    size = len(buffer)
+    pos = start
+    # Tag section: consecutive lines starting with "["
+    while pos < size and buffer[pos:pos + 1] == b"[":
+        newline = buffer.find(b"\n", pos)
+        if newline < 0:
+            return size, size
+        pos = newline + 1
+    end = _next_game_start(buffer, pos, pos)
+    return pos, size if end < 0 else end
+
+
+def read_game(buffer, offset: int) -> tuple[PgnGame, int]:
+    """Parse the game starting at offset; returns it with the offset just past it."""
+    movetext_start, end = find_game_end(buffer, offset)
+    headers = {
+        _decode(name): _tag_value(value)
+        for name, value in _TAG.findall(buffer[offset:movetext_start])
+    }
+    movetext = " ".join(_decode(buffer[movetext_start:end]).split())
+    return PgnGame(offset, headers, movetext), end
+
+
+def first_game_offset(buffer) -> int:
+    """Offset of the first tag line, or len(buffer) if there is none.
+
+    A leading UTF-8 byte-order mark and whitespace are skipped.
+    """
+    start = _LEADING.match(buffer).end()
+    if buffer[start:start + 1] == b"[":
+        return start
+    pos = _next_game_start(buffer, start, start)
+    return len(buffer) if pos < 0 else pos
+
+
+def iter_game_offsets(buffer) -> Iterator[tuple[int, int]]:
+    """Yield (start, end) byte ranges of every game in a PGN buffer."""
+    size = len(buffer)
+    pos = first_game_offset(buffer)
+    while pos < size:
+        _, end = find_game_end(buffer, pos)
+        yield pos, end
+        pos = end
+
+
+def iter_games(path: str | Path) -> Iterator[PgnGame]:
+    """Lazily yield every game of a PGN file."""
+    with open(path, "rb") as file:
+        if file.seek(0, 2) == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for start, _ in iter_game_offsets(buffer):
+                game, _ = read_game(buffer, start)
+                yield game
+
+
+# Sidecar index layout (little-endian, every section 8-byte aligned):
+#   header      magic, game count N, field count F, size and mtime (ns) of the
+#               indexed PGN file, length of the names section before padding
+#   names       F field names, NUL-separated and zero-padded
+#   offsets     uint64[N + 1]: game start offsets, then the PGN file size
+#   values      F x uint64[N + 1]: start of each game's value in the string pool
+#   pool        UTF-8 header values, concatenated
+INDEX_MAGIC = b"CEPGNIX2"
+INDEX_SUFFIX = ".idx"
+DEFAULT_INDEX_FIELDS = ("Event", "Date", "White", "Black", "Result")
+_INDEX_HEADER = struct.Struct("<8sQQQQQ")
+
+
+def _default_index_path(pgn_path: Path) -> Path:
+    return pgn_path.with_name(pgn_path.name + INDEX_SUFFIX)
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 8)
+
+
+def build_index(
+    pgn_path: str | Path,
+    index_path: str | Path | None = None,
+    fields: tuple[str, ...] = DEFAULT_INDEX_FIELDS,
+) -> Path:
+    """Index a PGN file in one pass and write the sidecar file; returns its path."""
+    pgn_path = Path(pgn_path)
+    index_path = Path(index_path) if index_path else _default_index_path(pgn_path)
+    wanted = {name.encode(): i for i, name in enumerate(fields)}
+    offsets = array("Q")
+    values = [array("Q") for _ in fields]
+    pools = [bytearray() for _ in fields]
+
+    with open(pgn_path, "rb") as file:
+        size = file.seek(0, 2)
+        mtime = os.fstat(file.fileno()).st_mtime_ns
+        if size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for start, _ in iter_game_offsets(buffer):
+                    offsets.append(start)
+                    movetext_start, _ = find_game_end(buffer, start)
+                    found = [b""] * len(fields)
+                    for name, value in _TAG.findall(buffer[start:movetext_start]):
+                        i = wanted.get(name)
+                        if i is not None:
+                            found[i] = value
+                    for i, value in enumerate(found):
+                        values[i].append(len(pools[i]))
+                        pools[i] += value
+    offsets.append(size)
+    # Each field's values are contiguous in the pool, so a value ends where the next one starts
+    base = 0
+    for i, pool in enumerate(pools):
+        values[i].append(len(pool))
+        if base:
+            values[i] = array("Q", (offset + base for offset in values[i]))
+        base += len(pool)
+
+    names = "\0".join(fields).encode()
+    tmp = index_path.with_suffix(index_path.suffix + ".tmp")
+    with open(tmp, "wb") as out:
+        out.write(_INDEX_HEADER.pack(INDEX_MAGIC, len(offsets) - 1, len(fields), size, mtime, len(names)))
+        out.write(_padded(names))
+        out.write(offsets.tobytes())
+        for column in values:
+            out.write(column.tobytes())
+        for pool in pools:
+            out.write(pool)
+    tmp.replace(index_path)
+    return index_path
+
+
+class PgnIndex:
+    """Random access to the games of a PGN file through its sidecar index.
+
+    Both files are memory-mapped, so opening is constant time and reading game
+    ``i`` seeks straight to its offset.
+    """
+
+    def __init__(self, pgn_path: str | Path, index_path: str | Path | None = None):
+        pgn_path = Path(pgn_path)
+        index_path = Path(index_path) if index_path else _default_index_path(pgn_path)
+        self._maps: list[mmap.mmap] = []
+        self._views: list[memoryview] = []
+
+        try:
+            self._open(pgn_path, index_path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, pgn_path: Path, index_path: Path):
+        index_map = self._map(index_path)
+        if len(index_map) < _INDEX_HEADER.size:
+            raise ValueError(f"Truncated PGN index: {index_path}")
+        magic, count, field_count, source_size, source_mtime, names_size = _INDEX_HEADER.unpack_from(index_map)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Not a PGN index: {index_path}")
+        pos = _INDEX_HEADER.size
+        names = index_map[pos:pos + names_size].decode()
+        self.fields: tuple[str, ...] = tuple(names.split("\0")) if field_count else ()
+        pos += names_size + (-names_size % 8)
+
+        column_size = 8 * (count + 1)
+        if pos + column_size * (1 + len(self.fields)) > len(index_map):
+            raise ValueError(f"Truncated PGN index: {index_path}")
+        self._offsets = self._view(index_map, pos, column_size, "Q")
+        pos += column_size
+        self._values = []
+        for _ in self.fields:
+            self._values.append(self._view(index_map, pos, column_size, "Q"))
+            pos += column_size
+        self._pool = self._view(index_map, pos, len(index_map) - pos)
+        self._count = count
+
+        # A same-size rewrite still moves the mtime
+        stat = pgn_path.stat()
+        if stat.st_size != source_size or stat.st_mtime_ns != source_mtime:
+            raise ValueError(f"Index {index_path} is stale for {pgn_path}")
+        self._pgn = self._map(pgn_path) if source_size else b""
+        if len(self._pgn) != source_size:
+            raise ValueError(f"Index {index_path} is stale for {pgn_path}")
+
+    def _map(self, path: Path) -> mmap.mmap:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _view(self, mapped: mmap.mmap, start: int, size: int, fmt: str = "B") -> memoryview:
+        # Every view is kept so close() can release it before unmapping
+        whole = memoryview(mapped)
+        part = whole[start:start + size]
+        view = part.cast(fmt)
+        self._views += (view, part, whole)
+        return view
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "PgnIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check(self, number: int):
+        if not 0 <= number < self._count:
+            raise IndexError(f"Game {number} out of range (0..{self._count - 1})")
+
+    def offset(self, number: int) -> int:
+        """Byte offset of game number (0-based) in the PGN file."""
+        self._check(number)
+        return self._offsets[number]
+
+    def header(self, number: int, field: str) -> str:
+        """An indexed header value of game number ("" if the game lacks it)."""
+        self._check(number)
+        try:
+            column = self._values[self.fields.index(field)]
+        except ValueError:
+            indexed = ", ".join(self.fields)
+            raise KeyError(f"Field {field!r} is not indexed (indexed fields: {indexed})") from None
+        return _tag_value(self._pool[column[number]:column[number + 1]])
+
+    def headers(self, number: int) -> dict[str, str]:
+        """All indexed header values of game number."""
+        return {field: self.header(number, field) for field in self.fields}
+
+    def read_game(self, number: int) -> PgnGame:
+        """Parse game number straight from its offset."""
+        self._check(number)
+        game, _ = read_game(self._pgn, self._offsets[number])
+        return game
+
+    def close(self):
+        """Release the memory maps."""
+        for view in self._views:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views = []
+        self._maps = []
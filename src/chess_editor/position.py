@@ -0,0 +1,249 @@
+"""Immutable full positions: placement plus game state."""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from chess_editor.attacks import pawn_attacks
+from chess_editor.board import (
+    CASTLING_LETTERS, ENCODED_SIZE, FEN_LETTERS, PIECES,
+    BoardSnapshot, ChessBoard, PieceColor, PieceType,
+)
+from chess_editor.utils.bitboard import SQUARE_INDEX
+from chess_editor.zobrist import state_key
+
+# Packed state layout, low bits first:
+#   bit 0        black to move
+#   bits 1-4     castling rights
+#   bits 5-11    en-passant square + 1 (0 when there is none)
+#   bits 12-27   halfmove clock
+#   bits 28-63   fullmove number
+CASTLING_SHIFT = 1
+EP_SHIFT = 5
+HALFMOVE_SHIFT = 12
+FULLMOVE_SHIFT = 28
+_HALFMOVE_LIMIT = 1 << 16
+_FULLMOVE_LIMIT = 1 << 36
+
+# Distinct FEN strings kept by parse_fen
+FEN_CACHE_SIZE = 4096
+
+# Placement characters: a piece, or the number of empty squares to skip
+_PLACEMENT_CHARS: dict[str, object] = {
+    **dict(zip(FEN_LETTERS, PIECES)),
+    **{str(n): n for n in range(1, 9)},
+}
+_TURNS = {"w": PieceColor.WHITE, "b": PieceColor.BLACK}
+_CASTLING_FLAGS = {letter: flag for flag, letter in CASTLING_LETTERS}
+
+# Bytes in Position.to_bytes(): the placement, then the state as a little-endian uint64
+POSITION_SIZE = ENCODED_SIZE + 8
+
+
+def pack_state(
+    turn: PieceColor,
+    castling_rights: int,
+    ep_square: Optional[int],
+    halfmove_clock: int,
+    fullmove_number: int,
+) -> int:
+    """Pack game state into a single int (see the layout above).
+
+    A fullmove number of 0, which some tools write, is stored as 1.
+    """
+    if not 0 <= halfmove_clock < _HALFMOVE_LIMIT or not 0 <= fullmove_number < _FULLMOVE_LIMIT:
+        raise ValueError(f"Move counters out of range: {halfmove_clock}, {fullmove_number}")
+    fullmove_number = max(fullmove_number, 1)
+    return (
+        (turn is PieceColor.BLACK)
+        | castling_rights << CASTLING_SHIFT
+        | (0 if ep_square is None else ep_square + 1) << EP_SHIFT
+        | halfmove_clock << HALFMOVE_SHIFT
+        | fullmove_number << FULLMOVE_SHIFT
+    )
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Position:
+    """A complete chess position: board placement and packed game state.
+
+    ``state`` is authoritative; the placement snapshot records the same game
+    state, so boards restored from it agree.
+
+    Hashing uses the placement Zobrist key combined with side to move, castling
+    rights and en-passant square, so positions that differ only in their move
+    counters share a hash. Equality compares everything.
+    """
+
+    placement: BoardSnapshot
+    state: int
+
+    @classmethod
+    def from_board(cls, board: ChessBoard) -> "Position":
+        """Capture a board's placement and game state."""
+        return cls(
+            board.snapshot(),
+            pack_state(board.turn, board.castling_rights, board.ep_square, board.halfmove_clock, board.fullmove_number),
+        )
+
+    @classmethod
+    def from_state(cls, board: ChessBoard, state: int) -> "Position":
+        """Combine a board's placement with a packed game state, which is applied to the board first."""
+        ep = state >> EP_SHIFT & 0x7F
+        board.turn = PieceColor.BLACK if state & 1 else PieceColor.WHITE
+        board.castling_rights = state >> CASTLING_SHIFT & 0xF
+        board.ep_square = ep - 1 if ep else None
+        board.halfmove_clock = state >> HALFMOVE_SHIFT & (_HALFMOVE_LIMIT - 1)
+        board.fullmove_number = state >> FULLMOVE_SHIFT
+        return cls(board.snapshot(), state)
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "Position":
+        """Parse a FEN string (cached, see parse_fen)."""
+        return parse_fen(fen)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset: int = 0) -> "Position":
+        """Decode a position from POSITION_SIZE bytes of a bytes-like object, starting at offset."""
+        view = memoryview(buffer)
+        if len(view) - offset < POSITION_SIZE:
+            raise ValueError(f"Need {POSITION_SIZE} bytes to decode a position, got {len(view) - offset}")
+        board = ChessBoard.from_buffer(view, offset)
+        state = int.from_bytes(view[offset + ENCODED_SIZE:offset + POSITION_SIZE], "little")
+        return cls.from_state(board, state)
+
+    def to_bytes(self) -> bytes:
+        """Encode as POSITION_SIZE bytes: 32 placement bytes then the packed state."""
+        return self.placement.to_bytes() + self.state.to_bytes(8, "little")
+
+    def to_board(self) -> ChessBoard:
+        """Create a mutable board holding this position."""
+        board = ChessBoard.from_snapshot(self.placement)
+        board.turn = self.turn
+        board.castling_rights = self.castling_rights
+        board.ep_square = self.ep_square
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        return board
+
+    def to_fen(self) -> str:
+        """Serialize as a FEN string."""
+        return self.to_board().to_fen()
+
+    @property
+    def turn(self) -> PieceColor:
+        """Side to move."""
+        return PieceColor.BLACK if self.state & 1 else PieceColor.WHITE
+
+    @property
+    def castling_rights(self) -> int:
+        """Castling rights as WHITE_KINGSIDE | ... flags."""
+        return self.state >> CASTLING_SHIFT & 0xF
+
+    @property
+    def ep_square(self) -> Optional[int]:
+        """En-passant target square, if any."""
+        ep = self.state >> EP_SHIFT & 0x7F
+        return ep - 1 if ep else None
+
+    @property
+    def halfmove_clock(self) -> int:
+        """Plies since the last capture or pawn move."""
+        return self.state >> HALFMOVE_SHIFT & (_HALFMOVE_LIMIT - 1)
+
+    @property
+    def fullmove_number(self) -> int:
+        """Move number, starting at 1 and incremented after Black moves."""
+        return self.state >> FULLMOVE_SHIFT
+
+    @property
+    def key(self) -> int:
+        """Zobrist key of the placement, side to move, castling rights and en passant."""
+        return self.placement.zobrist_key ^ state_key(bool(self.state & 1), self.castling_rights, self.ep_square)
+
+    def __hash__(self) -> int:
+        return self.key
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.state == other.state and self.placement == other.placement
+
+
+@lru_cache(maxsize=FEN_CACHE_SIZE)
+def parse_fen(fen: str) -> Position:
+    """Parse a FEN string into a Position, returning cached results for recently seen strings."""
+    return read_fen(fen)
+
+
+def read_fen(fen: str) -> Position:
+    """Parse a FEN string into a Position without going through the cache.
+
+    The placement is read in a single pass with a character lookup table. The
+    move counters may be omitted and default to 0 and 1. An en-passant square
+    is only kept when it follows a possible double pawn push and a pawn of the
+    side to move could capture there.
+    """
+    fields = fen.split()
+    if not 4 <= len(fields) <= 6:
+        raise ValueError(f"Invalid FEN (expected 4 to 6 fields): {fen!r}")
+
+    board = ChessBoard()
+    row = col = 0
+    for char in fields[0]:
+        if char == "/":
+            if col != 8 or row == 7:
+                raise ValueError(f"Invalid FEN (expected 8 ranks of 8 squares): {fen!r}")
+            row += 1
+            col = 0
+            continue
+        entry = _PLACEMENT_CHARS.get(char)
+        if entry is None:
+            raise ValueError(f"Invalid FEN placement character {char!r}: {fen!r}")
+        if isinstance(entry, int):
+            col += entry
+        else:
+            if col > 7:
+                raise ValueError(f"Invalid FEN (expected 8 ranks of 8 squares): {fen!r}")
+            board.set_piece(row, col, entry)
+            col += 1
+        if col > 8:
+            raise ValueError(f"Invalid FEN (expected 8 ranks of 8 squares): {fen!r}")
+    if row != 7 or col != 8:
+        raise ValueError(f"Invalid FEN (expected 8 ranks of 8 squares): {fen!r}")
+
+    turn = _TURNS.get(fields[1])
+    if turn is None:
+        raise ValueError(f"Invalid FEN side to move {fields[1]!r}: {fen!r}")
+
+    castling_rights = 0
+    if fields[2] != "-":
+        for char in fields[2]:
+            flag = _CASTLING_FLAGS.get(char)
+            if flag is None:
+                raise ValueError(f"Invalid FEN castling field {fields[2]!r}: {fen!r}")
+            castling_rights |= flag
+
+    ep_square = None
+    if fields[3] != "-":
+        ep_square = SQUARE_INDEX.get(fields[3])
+        expected_row = 2 if turn is PieceColor.WHITE else 5
+        if ep_square is None or ep_square >> 3 != expected_row:
+            raise ValueError(f"Invalid FEN en-passant square {fields[3]!r}: {fen!r}")
+        opponent = PieceColor.BLACK if turn is PieceColor.WHITE else PieceColor.WHITE
+        # The opponent's pawn must have just passed ep_square: it stands one row
+        # beyond it, and both ep_square and the square it started from are empty
+        step = 8 if turn is PieceColor.WHITE else -8
+        pushed = board.pieces_mask(PieceType.PAWN, opponent) >> (ep_square + step) & 1
+        vacated = not board.occupied & (1 << ep_square | 1 << (ep_square - step))
+        capturable = pawn_attacks(opponent, ep_square) & board.pieces_mask(PieceType.PAWN, turn)
+        if not (pushed and vacated and capturable):
+            ep_square = None
+
+    try:
+        halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        state = pack_state(turn, castling_rights, ep_square, halfmove_clock, fullmove_number)
+    except ValueError:
+        raise ValueError(f"Invalid FEN move counters: {fen!r}") from None
+    return Position.from_state(board, state)
@@ -0,0 +1,106 @@
+"""Static exchange evaluation.
+
+SEE plays out the sequence of captures on one square without touching the
+board: attackers of both sides come from one bitboard, each side recaptures
+with its least valuable attacker, and removing that attacker from the
+occupancy uncovers any slider standing behind it (x-rays). The swap list is
+then folded back, letting either side stop capturing when continuing loses.
+Pins are ignored, as usual for SEE.
+"""
+
+from typing import Union
+
+from chess_editor.attacks import slider_tables
+from chess_editor.board import PIECE_TYPES, PROMOTION_CODES, ChessBoard, Move, PieceColor, PieceType
+from chess_editor.movegen import attackers_to
+
+# Piece values in centipawns, in PIECE_TYPES order (pawn, knight, bishop, rook, queen, king)
+PIECE_VALUES = (100, 320, 330, 500, 900, 20000)
+_TYPE_VALUES = dict(zip(PIECE_TYPES, PIECE_VALUES))
+_PAWN, _BISHOP, _ROOK, _QUEEN, _KING = 0, 2, 3, 4, 5
+_PROMOTION_GAIN = PIECE_VALUES[_QUEEN] - PIECE_VALUES[_PAWN]
+_BACK_RANKS = 0xFF | 0xFF << 56
+
+
+def see(board: ChessBoard, move: Union[Move, int]) -> int:
+    """Material won by the side to move in the exchange move starts on its target square.
+
+    Positive means the capture wins material. Quiet moves are evaluated too: the
+    result is minus what the moved piece loses if the opponent takes it.
+    """
+    if isinstance(move, int):
+        from_square, to_square, promotion = move & 63, move >> 6 & 63, PROMOTION_CODES[move >> 12]
+    else:
+        from_square, to_square, promotion = move
+    bitboards = board.bitboards
+    sliders = slider_tables()
+    promotes = bool(1 << to_square & _BACK_RANKS)
+
+    mover = board.piece_at(from_square)
+    captured = board.piece_at(to_square)
+    occupied = board.occupied ^ (1 << from_square)
+    gain = [0 if captured is None else PIECE_VALUES[captured.index % 6]]
+    if captured is None and to_square == board.ep_square and mover.index % 6 == _PAWN:
+        gain[0] = PIECE_VALUES[_PAWN]
+        occupied ^= 1 << (to_square + (8 if mover.color is PieceColor.WHITE else -8))
+    # Value of the piece standing on the square, which the next capture wins
+    if promotion is not None:
+        on_square = _TYPE_VALUES[promotion]
+        gain[0] += on_square - PIECE_VALUES[_PAWN]
+    else:
+        on_square = PIECE_VALUES[mover.index % 6]
+
+    rooks = bitboards[_ROOK] | bitboards[_QUEEN] | bitboards[6 + _ROOK] | bitboards[6 + _QUEEN]
+    bishops = bitboards[_BISHOP] | bitboards[_QUEEN] | bitboards[6 + _BISHOP] | bitboards[6 + _QUEEN]
+    attackers = (
+        attackers_to(board, to_square, PieceColor.WHITE, occupied)
+        | attackers_to(board, to_square, PieceColor.BLACK, occupied)
+    ) & occupied
+    side = 1 if mover.color is PieceColor.WHITE else 0
+
+    while True:
+        ours = attackers & board.occupied_co[side]
+        if not ours:
+            break
+        for piece_type in range(6):
+            candidates = ours & bitboards[side * 6 + piece_type]
+            if candidates:
+                break
+        if piece_type == _KING and attackers & ~ours:
+            # The king cannot capture onto a defended square
+            break
+        gain.append(on_square - gain[-1])
+        on_square = PIECE_VALUES[piece_type]
+        if piece_type == _PAWN and promotes:
+            on_square += _PROMOTION_GAIN
+            gain[-1] += _PROMOTION_GAIN
+        occupied ^= candidates & -candidates
+        # Sliders lined up behind the piece that just captured join in
+        attackers |= (
+            sliders.rook[to_square][occupied & sliders.rook_masks[to_square]] & rooks
+            | sliders.bishop[to_square][occupied & sliders.bishop_masks[to_square]] & bishops
+        )
+        attackers &= occupied
+        side ^= 1
+
+    # Either side may stop capturing when going on would lose
+    for depth in range(len(gain) - 1, 0, -1):
+        gain[depth - 1] = -max(-gain[depth - 1], gain[depth])
+    return gain[0]
+
+
+def is_hanging(board: ChessBoard, square: int) -> bool:
+    """True if the opponent of the piece on square wins material by capturing it."""
+    piece = board.piece_at(square)
+    if piece is None:
+        return False
+    enemy = PieceColor.BLACK if piece.color is PieceColor.WHITE else PieceColor.WHITE
+    promotes = bool(1 << square & _BACK_RANKS)
+    attackers = attackers_to(board, square, enemy)
+    while attackers:
+        attacker = (attackers & -attackers).bit_length() - 1
+        attackers &= attackers - 1
+        promotion = PieceType.QUEEN if promotes and board.piece_at(attacker).piece_type is PieceType.PAWN else None
+        if see(board, Move(attacker, square, promotion)) > 0:
+            return True
+    return False
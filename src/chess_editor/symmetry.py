@@ -0,0 +1,96 @@
+"""Canonical forms of positions under board symmetries.
+
+Swapping the colors (and mirroring the board top to bottom) never changes a
+position's value, so every position has a color-flipped twin. Without castling
+rights, mirroring left to right is also harmless, and pawnless positions
+without castling rights are unchanged by all 8 symmetries of the square. The
+canonical form is the smallest of the allowed variants, so twins share one
+canonical Position and key.
+"""
+
+from collections.abc import Callable
+from itertools import product
+from typing import Optional
+
+from chess_editor.board import ChessBoard, PieceColor
+from chess_editor.position import Position
+from chess_editor.utils.bitboard import flip_diagonal, flip_vertical, iter_squares, mirror_horizontal
+from chess_editor.zobrist import PIECE_SQUARE_KEYS, state_key
+
+Transform = tuple[Callable[[int], int], ...]
+
+# Transforms as sequences of bitboard mirrors; (flip_diagonal, flip_vertical) is a rotation
+_IDENTITY: tuple[Transform, ...] = ((),)
+_MIRRORS: tuple[Transform, ...] = ((), (mirror_horizontal,))
+_ALL_SYMMETRIES: tuple[Transform, ...] = tuple(
+    tuple(step for step, used in zip((flip_diagonal, flip_vertical, mirror_horizontal), flags) if used)
+    for flags in product((False, True), repeat=3)
+)
+
+
+def _apply(transform: Transform, mask: int) -> int:
+    for step in transform:
+        mask = step(mask)
+    return mask
+
+
+def _transforms(board: ChessBoard) -> tuple[Transform, ...]:
+    if board.castling_rights:
+        return _IDENTITY
+    if board.bitboards[0] | board.bitboards[6]:
+        return _MIRRORS
+    return _ALL_SYMMETRIES
+
+
+def _color_flipped(board: ChessBoard) -> tuple[list[int], bool, int, Optional[int]]:
+    bitboards = [flip_vertical(mask) for mask in board.bitboards[6:] + board.bitboards[:6]]
+    castling = board.castling_rights >> 2 | (board.castling_rights & 3) << 2
+    ep = None if board.ep_square is None else board.ep_square ^ 56
+    return bitboards, board.turn is PieceColor.WHITE, castling, ep
+
+
+def _canonical_variant(board: ChessBoard) -> tuple[tuple[int, ...], bool, int, int]:
+    # The smallest (bitboards, black to move, castling, ep or -1) over the allowed variants
+    variants = (
+        (board.bitboards, board.turn is PieceColor.BLACK, board.castling_rights, board.ep_square),
+        _color_flipped(board),
+    )
+    best = None
+    for transform in _transforms(board):
+        for bitboards, black_to_move, castling, ep in variants:
+            candidate = (
+                tuple(_apply(transform, mask) for mask in bitboards),
+                black_to_move,
+                castling,
+                -1 if ep is None else _apply(transform, 1 << ep).bit_length() - 1,
+            )
+            if best is None or candidate < best:
+                best = candidate
+    return best
+
+
+def canonical_position(board: ChessBoard) -> Position:
+    """Return the canonical Position among the board's symmetric variants.
+
+    Move counters are kept as they are; everything else is taken from the
+    variant whose bitboards, side to move, castling rights and en-passant
+    square compare smallest.
+    """
+    bitboards, black_to_move, castling, ep = _canonical_variant(board)
+    canonical = ChessBoard.from_bitboards(bitboards)
+    canonical.turn = PieceColor.BLACK if black_to_move else PieceColor.WHITE
+    canonical.castling_rights = castling
+    canonical.ep_square = None if ep < 0 else ep
+    canonical.halfmove_clock = board.halfmove_clock
+    canonical.fullmove_number = board.fullmove_number
+    return Position.from_board(canonical)
+
+
+def canonical_key(board: ChessBoard) -> int:
+    """Zobrist key of the canonical position, shared by all symmetric variants."""
+    bitboards, black_to_move, castling, ep = _canonical_variant(board)
+    key = state_key(black_to_move, castling, None if ep < 0 else ep)
+    for keys, mask in zip(PIECE_SQUARE_KEYS, bitboards):
+        for square in iter_squares(mask):
+            key ^= keys[square]
+    return key
@@ -0,0 +1,67 @@
+"""Bitboard helpers.
+
+A bitboard is a 64-bit integer with one bit per square. Square indices follow
+the board's row-major layout: ``square = row * 8 + col``, so a8 is 0 and h1 is 63.
+"""
+
+from collections.abc import Iterator
+
+EMPTY = 0
+FULL = (1 << 64) - 1
+
+
+def square_index(row: int, col: int) -> int:
+    """Return the square index for (row, col)."""
+    return row * 8 + col
+
+
+def square_coords(square: int) -> tuple[int, int]:
+    """Return (row, col) for a square index."""
+    return square >> 3, square & 7
+
+
+# SQUARE_NAMES[square] is the algebraic name; SQUARE_INDEX maps it back
+SQUARE_NAMES: tuple[str, ...] = tuple("abcdefgh"[sq & 7] + str(8 - (sq >> 3)) for sq in range(64))
+SQUARE_INDEX: dict[str, int] = {name: sq for sq, name in enumerate(SQUARE_NAMES)}
+
+
+def square_name(square: int) -> str:
+    """Return the algebraic name of a square index, e.g. 60 -> "e1"."""
+    return SQUARE_NAMES[square]
+
+
+def iter_squares(mask: int) -> Iterator[int]:
+    """Yield the square index of every set bit, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def lsb(mask: int) -> int:
+    """Return the index of the lowest set bit (mask must be non-zero)."""
+    return (mask & -mask).bit_length() - 1
+
+
+def flip_vertical(mask: int) -> int:
+    """Mirror a bitboard top to bottom (rank 8 <-> rank 1)."""
+    # One byte per row, so reversing the byte order reverses the rows
+    return int.from_bytes(mask.to_bytes(8, "little"), "big")
+
+
+def mirror_horizontal(mask: int) -> int:
+    """Mirror a bitboard left to right (a-file <-> h-file)."""
+    mask = (mask >> 1) & 0x5555555555555555 | (mask & 0x5555555555555555) << 1
+    mask = (mask >> 2) & 0x3333333333333333 | (mask & 0x3333333333333333) << 2
+    return (mask >> 4) & 0x0F0F0F0F0F0F0F0F | (mask & 0x0F0F0F0F0F0F0F0F) << 4
+
+
+def flip_diagonal(mask: int) -> int:
+    """Mirror a bitboard about the a8-h1 diagonal, swapping rows and columns."""
+    # Delta swaps exchanging the row and column halves of each square index
+    t = 0x0F0F0F0F00000000 & (mask ^ mask << 28)
+    mask ^= t ^ t >> 28
+    t = 0x3333000033330000 & (mask ^ mask << 14)
+    mask ^= t ^ t >> 14
+    t = 0x5500550055005500 & (mask ^ mask << 7)
+    return mask ^ t ^ t >> 7
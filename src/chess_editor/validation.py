@@ -0,0 +1,136 @@
+"""Vectorized structural checks over a BoardBatch.
+
+Every check is a handful of uint64 array operations over the whole batch;
+attacks on the kings are found with shift-based fills rather than the
+per-square lookup tables, so no Python loop runs per position.
+"""
+
+import numpy as np
+
+from chess_editor.batch import BoardBatch
+from chess_editor.board import (
+    BLACK_KINGSIDE, BLACK_QUEENSIDE, PIECE_INDEX, WHITE_KINGSIDE, WHITE_QUEENSIDE,
+    PieceColor, PieceType,
+)
+from chess_editor.position import CASTLING_SHIFT
+
+# Problem flags, OR-ed together per position in the validate() result
+BAD_KING_COUNT = 1
+PAWN_ON_BACK_RANK = 2
+OPPONENT_IN_CHECK = 4
+BAD_CASTLING_RIGHTS = 8
+
+_BACK_RANKS = np.uint64(0xFF | 0xFF << 56)
+_NOT_FILE_A = np.uint64(~0x0101010101010101 & (1 << 64) - 1)
+_NOT_FILE_H = np.uint64(~0x8080808080808080 & (1 << 64) - 1)
+_ALL = np.uint64((1 << 64) - 1)
+
+# One-square steps as (bit shift, mask of squares that can be reached without
+# wrapping around a file edge); row 0 is rank 8, so north is a right shift
+_NORTH, _SOUTH = (-8, _ALL), (8, _ALL)
+_EAST, _WEST = (1, _NOT_FILE_A), (-1, _NOT_FILE_H)
+_NORTH_EAST, _NORTH_WEST = (-7, _NOT_FILE_A), (-9, _NOT_FILE_H)
+_SOUTH_EAST, _SOUTH_WEST = (9, _NOT_FILE_A), (7, _NOT_FILE_H)
+_ORTHOGONAL = (_NORTH, _SOUTH, _EAST, _WEST)
+_DIAGONAL = (_NORTH_EAST, _NORTH_WEST, _SOUTH_EAST, _SOUTH_WEST)
+_KNIGHT_JUMPS = (
+    (-17, _NOT_FILE_H), (-15, _NOT_FILE_A), (-10, _NOT_FILE_H & (_NOT_FILE_H >> np.uint64(1))),
+    (-6, _NOT_FILE_A & (_NOT_FILE_A << np.uint64(1))), (6, _NOT_FILE_H & (_NOT_FILE_H >> np.uint64(1))),
+    (10, _NOT_FILE_A & (_NOT_FILE_A << np.uint64(1))), (15, _NOT_FILE_H), (17, _NOT_FILE_A),
+)
+
+# (flag, king square, rook square, piece color) for each castling right
+_CASTLING_HOMES = (
+    (WHITE_KINGSIDE, 60, 63, PieceColor.WHITE),
+    (WHITE_QUEENSIDE, 60, 56, PieceColor.WHITE),
+    (BLACK_KINGSIDE, 4, 7, PieceColor.BLACK),
+    (BLACK_QUEENSIDE, 4, 0, PieceColor.BLACK),
+)
+
+
+def _step(masks: np.ndarray, step) -> np.ndarray:
+    shift, allowed = step
+    if shift > 0:
+        return (masks << np.uint64(shift)) & allowed
+    return (masks >> np.uint64(-shift)) & allowed
+
+
+def _slide(origins: np.ndarray, empty: np.ndarray, directions) -> np.ndarray:
+    # Squares reached from origins along each direction, up to and including the first blocker
+    attacks = np.zeros_like(origins)
+    for direction in directions:
+        front = origins
+        for _ in range(7):
+            front = _step(front, direction)
+            attacks |= front
+            front &= empty
+    return attacks
+
+
+def _column(bitboards: np.ndarray, piece_type: PieceType, color: PieceColor) -> np.ndarray:
+    return bitboards[:, PIECE_INDEX[(color, piece_type)]]
+
+
+def validate(batch: BoardBatch) -> np.ndarray:
+    """Return the problem flags of every position, shape (N,); 0 means valid.
+
+    Positions without stored states are checked as white to move with no
+    castling rights, the defaults of a fresh ChessBoard.
+    """
+    bitboards = batch.bitboards
+    flags = np.zeros(len(batch), dtype=np.uint8)
+    if batch.states is None:
+        states = np.zeros(len(batch), dtype=np.uint64)
+    else:
+        states = batch.states
+    black_to_move = (states & np.uint64(1)).astype(bool)
+    castling = (states >> np.uint64(CASTLING_SHIFT)) & np.uint64(0xF)
+
+    white_kings = _column(bitboards, PieceType.KING, PieceColor.WHITE)
+    black_kings = _column(bitboards, PieceType.KING, PieceColor.BLACK)
+    flags[(np.bitwise_count(white_kings) != 1) | (np.bitwise_count(black_kings) != 1)] |= BAD_KING_COUNT
+
+    pawns = _column(bitboards, PieceType.PAWN, PieceColor.WHITE) | _column(bitboards, PieceType.PAWN, PieceColor.BLACK)
+    flags[(pawns & _BACK_RANKS) != 0] |= PAWN_ON_BACK_RANK
+
+    # The side to move attacks the other side's king
+    king = np.where(black_to_move, white_kings, black_kings)
+    white, black = bitboards[:, :6], bitboards[:, 6:]
+    attackers = np.where(black_to_move[:, None], black, white)
+    pawn, knight, bishop, rook, queen, enemy_king = attackers.T
+    empty = ~np.bitwise_or.reduce(bitboards, axis=1)
+    # A white pawn attacks north-east and north-west, so it hits a king from the
+    # king's south-east or south-west, and the other way round for black
+    pawn_sources = np.where(
+        black_to_move,
+        _step(king, _NORTH_EAST) | _step(king, _NORTH_WEST),
+        _step(king, _SOUTH_EAST) | _step(king, _SOUTH_WEST),
+    )
+    knight_sources = np.zeros_like(king)
+    for jump in _KNIGHT_JUMPS:
+        knight_sources |= _step(king, jump)
+    king_sources = np.zeros_like(king)
+    for step in _ORTHOGONAL + _DIAGONAL:
+        king_sources |= _step(king, step)
+    hits = (
+        (pawn_sources & pawn)
+        | (knight_sources & knight)
+        | (king_sources & enemy_king)
+        | (_slide(king, empty, _ORTHOGONAL) & (rook | queen))
+        | (_slide(king, empty, _DIAGONAL) & (bishop | queen))
+    )
+    flags[hits != 0] |= OPPONENT_IN_CHECK
+
+    # Every castling right needs its king and rook on their home squares
+    bad_castling = np.zeros(len(batch), dtype=bool)
+    for flag, king_square, rook_square, color in _CASTLING_HOMES:
+        home_king = (_column(bitboards, PieceType.KING, color) >> np.uint64(king_square)) & np.uint64(1)
+        home_rook = (_column(bitboards, PieceType.ROOK, color) >> np.uint64(rook_square)) & np.uint64(1)
+        bad_castling |= ((castling & np.uint64(flag)) != 0) & ((home_king & home_rook) == 0)
+    flags[bad_castling] |= BAD_CASTLING_RIGHTS
+    return flags
+
+
+def valid_mask(batch: BoardBatch) -> np.ndarray:
+    """Boolean mask of the structurally valid positions, shape (N,)."""
+    return validate(batch) == 0
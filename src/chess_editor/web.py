@@ -1,7 +1,7 @@
 """Flask web server for the chess board editor."""
 
 import os
-from flask import Flask
+from flask import Flask, request
 from chess_editor.board import ChessBoard
 
 
@@ -63,8 +63,15 @@ def create_app() -> Flask:
 
     @app.route("/")
     def index():
-        board = ChessBoard()
-        board.setup_standard_position()
+        fen = request.args.get("fen")
+        if fen is None:
+            board = ChessBoard()
+            board.setup_standard_position()
+        else:
+            try:
+                board = ChessBoard.from_fen(fen)
+            except ValueError as error:
+                return str(error), 400, {"Content-Type": "text/plain; charset=utf-8"}
         return render_board_html(board), 200, {"Content-Type": "text/html; charset=utf-8"}
 
     return app
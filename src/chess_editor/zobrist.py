@@ -0,0 +1,32 @@
+"""Zobrist hashing keys.
+
+A placement key is the XOR of one random 64-bit key per occupied (piece, square),
+so it can be updated incrementally when a single square changes.
+"""
+
+import random
+
+# Fixed seed so keys are stable across processes and runs
+_rng = random.Random(0x5EED_C4E55)
+
+# PIECE_SQUARE_KEYS[piece.index][square]
+PIECE_SQUARE_KEYS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_rng.getrandbits(64) for _ in range(64)) for _ in range(12)
+)
+
+# Game-state keys, XORed into the placement key to identify a full position
+BLACK_TO_MOVE_KEY: int = _rng.getrandbits(64)
+# CASTLING_KEYS[castling_rights]: one key per combination of the four flags
+CASTLING_KEYS: tuple[int, ...] = (0, *(_rng.getrandbits(64) for _ in range(15)))
+# EP_FILE_KEYS[col] for the column of the en-passant square
+EP_FILE_KEYS: tuple[int, ...] = tuple(_rng.getrandbits(64) for _ in range(8))
+
+
+def state_key(black_to_move: bool, castling_rights: int, ep_square: int | None) -> int:
+    """Key for the non-placement part of a position."""
+    key = CASTLING_KEYS[castling_rights]
+    if black_to_move:
+        key ^= BLACK_TO_MOVE_KEY
+    if ep_square is not None:
+        key ^= EP_FILE_KEYS[ep_square & 7]
+    return key
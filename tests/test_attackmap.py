@@ -0,0 +1,55 @@
+import pytest
+
+from chess_editor.attackmap import AttackMap
+from chess_editor.board import STARTING_FEN, ChessBoard, Piece, PieceColor, PieceType
+
+WHITE_ROOK = Piece(PieceType.ROOK, PieceColor.WHITE)
+WHITE_QUEEN = Piece(PieceType.QUEEN, PieceColor.WHITE)
+BLACK_KNIGHT = Piece(PieceType.KNIGHT, PieceColor.BLACK)
+BLACK_BISHOP = Piece(PieceType.BISHOP, PieceColor.BLACK)
+BLACK_PAWN = Piece(PieceType.PAWN, PieceColor.BLACK)
+
+# (row, col, piece) edits; row 0 is rank 8
+EDITS = [
+    (6, 4, None),  # e2 pawn gone: opens the f1 bishop and the d1 queen
+    (4, 4, WHITE_ROOK),  # rook on the empty e4
+    (4, 4, BLACK_KNIGHT),  # replaced by a knight
+    (1, 3, None),  # d7 pawn gone: opens the d8 queen and the c8 bishop
+    (3, 3, WHITE_QUEEN),  # queen on d5 blocks the d-file again
+    (5, 5, BLACK_BISHOP),  # bishop on f3 cuts the d1-h5 diagonal
+    (4, 4, None),  # e4 emptied
+    (4, 4, None),  # and emptied again, a no-op
+    (5, 5, BLACK_PAWN),  # bishop replaced by a pawn
+    (0, 3, None),  # d8 queen removed while its file is open up to d5
+    (3, 3, None),  # d5 emptied: the d-file is clear from d1 to d8
+]
+
+
+@pytest.mark.parametrize("fen", [STARTING_FEN, "r3k2r/8/2b5/8/3Q4/8/8/R3K2R w KQkq - 0 1"])
+def test_edits_match_a_fresh_count(fen):
+    board = ChessBoard.from_fen(fen)
+    attack_map = AttackMap(board)
+    for row, col, piece in EDITS:
+        assert attack_map.set_piece(row, col, piece)
+        assert attack_map.counts == AttackMap(board).counts, (row, col, piece)
+
+
+def test_out_of_range_edit_is_rejected():
+    board = ChessBoard.from_fen(STARTING_FEN)
+    attack_map = AttackMap(board)
+    counts = [list(side) for side in attack_map.counts]
+    assert not attack_map.set_piece(8, 0, WHITE_ROOK)
+    assert not attack_map.set_piece(0, -1, WHITE_ROOK)
+    assert attack_map.counts == counts
+    assert board.to_fen() == STARTING_FEN
+
+
+def test_counts():
+    board = ChessBoard.from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+    attack_map = AttackMap(board)
+    # a1 rook and e1 king both hit d1; only the rook reaches a8
+    assert attack_map.attack_count(PieceColor.WHITE, 59) == 2
+    assert attack_map.attack_count(PieceColor.WHITE, 0) == 1
+    assert attack_map.attack_count(PieceColor.BLACK, 3) == 1
+    assert attack_map.balance(59) == 2
+    assert attack_map.balance(3) == -1
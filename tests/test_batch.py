@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from chess_editor.batch import BoardBatch
+from chess_editor.board import ChessBoard
+from chess_editor.position import Position
+
+FENS = [
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b Kq - 4 20",
+]
+# The same positions with colors swapped
+FLIPPED = [
+    "rnbqkbnr/pppp1ppp/8/8/3PpP2/8/PPP1P1PP/RNBQKBNR b KQkq f3 0 3",
+    "r3k2r/pppbbppp/2n2q1P/1P2p3/3pn3/BN2PNP1/P1PPQPB1/R3K2R w Qk - 4 20",
+]
+
+
+def batch_of(fens):
+    return BoardBatch.from_position_buffer(b"".join(Position.from_fen(fen).to_bytes() for fen in fens))
+
+
+def test_color_flipped_keeps_states():
+    flipped = batch_of(FENS).color_flipped()
+    assert [flipped.position(i).to_fen() for i in range(len(FENS))] == FLIPPED
+    assert flipped.color_flipped().equal(batch_of(FENS)).all()
+
+
+def test_mirrored_keeps_states():
+    batch = batch_of(FENS)
+    mirrored = batch.mirrored()
+    assert mirrored.position(0).ep_square == Position.from_fen(FENS[0]).ep_square ^ 56
+    assert (mirrored.states & np.uint64(1)).tolist() == [0, 1]
+    assert mirrored.mirrored().equal(batch).all()
+
+
+def test_equal_compares_states():
+    white = batch_of(["4k3/8/8/8/8/8/8/4K3 w - - 0 1"])
+    black = batch_of(["4k3/8/8/8/8/8/8/4K3 b - - 0 1"])
+    assert not white.equal(black).any()
+    assert BoardBatch(white.bitboards).equal(black).all()
+
+
+def test_from_packed_rejects_bad_codes():
+    packed = np.zeros((2, 32), dtype=np.uint8)
+    BoardBatch.from_packed(packed)
+    packed[1, 5] = 0x0D
+    with pytest.raises(ValueError):
+        BoardBatch.from_packed(packed)
+    packed[1, 5] = 0xE0
+    with pytest.raises(ValueError):
+        BoardBatch.from_packed(packed)
+
+
+def test_position_placement_carries_state():
+    batch = batch_of(FENS)
+    for i, fen in enumerate(FENS):
+        assert ChessBoard.from_snapshot(batch.position(i).placement).to_fen() == fen
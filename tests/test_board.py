@@ -0,0 +1,80 @@
+import pickle
+
+import pytest
+
+from chess_editor.board import STARTING_FEN, ChessBoard, Piece, PieceColor, PieceType, material_key
+from chess_editor.notation import parse_san
+
+
+def play(board, *moves):
+    for san in moves:
+        board.make_move(parse_san(board, san))
+
+
+def test_restore_returns_to_snapshot_state():
+    board = ChessBoard()
+    board.setup_standard_position()
+    snapshot = board.snapshot()
+    play(board, "e4", "e5", "Nf3")
+    board.restore(snapshot)
+    assert board.to_fen() == STARTING_FEN
+    # Moves from the abandoned line can no longer be taken back
+    with pytest.raises(IndexError):
+        board.unmake_move()
+    play(board, "Nf3")
+    board.unmake_move()
+    assert board.to_fen() == STARTING_FEN
+
+
+def test_restore_forgets_repetition_history():
+    board = ChessBoard.from_fen(STARTING_FEN)
+    snapshot = board.snapshot()
+    play(board, "Nf3", "Nf6", "Ng1", "Ng8", "Nf3", "Nf6", "Ng1", "Ng8")
+    assert board.is_repetition()
+    board.restore(snapshot)
+    assert not board.is_repetition(2)
+
+
+def test_pieces_are_shared_and_immutable():
+    king = Piece.of(PieceType.KING, PieceColor.WHITE)
+    assert Piece(PieceType.KING, PieceColor.WHITE) is king
+    assert pickle.loads(pickle.dumps(king)) is king
+    with pytest.raises(AttributeError):
+        king.color = PieceColor.BLACK
+    with pytest.raises(AttributeError):
+        del king.index
+    with pytest.raises(AttributeError):
+        king.extra = 1
+    assert king.color is PieceColor.WHITE and king.index == 5
+
+
+@pytest.mark.parametrize(
+    ("fen", "signature", "counts"),
+    [
+        (STARTING_FEN, "KQRRBBNNPPPPPPPPvKQRRBBNNPPPPPPPP", (8, 2, 2, 2, 1, 1) * 2),
+        ("8/8/4k3/3r4/8/8/2PK1R2/8 w - - 0 1", "KRPvKR", (1, 0, 0, 1, 0, 1, 0, 0, 0, 1, 0, 1)),
+        ("8/8/8/3k4/8/8/8/3K4 w - - 0 1", "KvK", (0, 0, 0, 0, 0, 1) * 2),
+        ("1n2k3/8/8/8/8/8/8/Q2BK3 b - - 0 1", "KQBvKN", (0, 0, 1, 0, 1, 1, 0, 1, 0, 0, 0, 1)),
+    ],
+)
+def test_material(fen, signature, counts):
+    board = ChessBoard.from_fen(fen)
+    assert board.material_signature == signature
+    assert board.piece_counts() == counts
+    assert board.count(PieceType.KING, PieceColor.BLACK) == 1
+    assert board.material_key == material_key(board.bitboards)
+
+
+def test_material_key_follows_moves_and_restore():
+    board = ChessBoard.from_fen("rn2k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+    key = board.material_key
+    snapshot = board.snapshot()
+    play(board, "bxa8=Q")
+    assert board.material_signature == "KQvKN"
+    assert board.material_key == material_key(board.bitboards)
+    board.unmake_move()
+    assert board.material_key == key
+    play(board, "bxa8=N", "Kd7", "Nb6+")
+    board.restore(snapshot)
+    assert board.material_key == key
+    assert board.material_signature == "KPvKRN"
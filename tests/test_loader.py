@@ -0,0 +1,36 @@
+import pytest
+
+from chess_editor.loader import iter_positions, parse_line
+
+
+@pytest.mark.parametrize("line, halfmove_clock, fullmove_number", [
+    ("8/8/8/4k3/8/8/1P6/R3K2r w - - 7", 7, 1),
+    ("8/8/8/4k3/8/8/1P6/R3K2r w - - 7 40", 7, 40),
+    ("8/8/8/4k3/8/8/1P6/R3K2r w - -", 0, 1),
+    ('8/8/8/4k3/8/8/1P6/R3K2r w - - bm Kd1; id "x";', 0, 1),
+    ('8/8/8/4k3/8/8/1P6/R3K2r w - - 3 9 id "x";', 3, 9),
+])
+def test_parse_line_move_counters(line, halfmove_clock, fullmove_number):
+    position = parse_line(line)
+    assert position.halfmove_clock == halfmove_clock
+    assert position.fullmove_number == fullmove_number
+
+
+def test_invalid_utf8_line_is_skipped(tmp_path):
+    path = tmp_path / "positions.epd"
+    path.write_bytes(
+        b"4k3/8/8/8/8/8/8/4K3 w - - 0 1\n"
+        b"\xff\xfe not a position\n"
+        b"4k3/8/8/8/8/8/8/3K4 b - - 2 5\n"
+    )
+    positions = list(iter_positions(path, jobs=1, skip_invalid=True))
+    assert [position.to_fen() for position in positions] == [
+        "4k3/8/8/8/8/8/8/4K3 w - - 0 1",
+        "4k3/8/8/8/8/8/8/3K4 b - - 2 5",
+    ]
+    with pytest.raises(ValueError, match="Line 2"):
+        list(iter_positions(path, jobs=1))
+
+
+def test_zero_fullmove_number_loads():
+    assert parse_line("4k3/8/8/8/8/8/8/4K3 w - - 0 0").fullmove_number == 1
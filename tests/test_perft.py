@@ -0,0 +1,40 @@
+import pytest
+
+from chess_editor.board import ChessBoard, STARTING_FEN
+from chess_editor.perft import divide, parallel_divide, parallel_perft, perft
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+POSITION_3 = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+POSITION_4 = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+POSITION_5 = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+POSITION_6 = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+# Published node counts, from depth 1 up
+PERFT_COUNTS = [
+    (STARTING_FEN, [20, 400, 8902, 197281]),
+    (KIWIPETE, [48, 2039, 97862]),
+    (POSITION_3, [14, 191, 2812, 43238, 674624]),
+    (POSITION_4, [6, 264, 9467]),
+    (POSITION_5, [44, 1486, 62379]),
+    (POSITION_6, [46, 2079, 89890]),
+]
+
+
+@pytest.mark.parametrize("use_table", [False, True], ids=["plain", "table"])
+@pytest.mark.parametrize("fen, counts", PERFT_COUNTS, ids=["start", "kiwipete", "pos3", "pos4", "pos5", "pos6"])
+def test_perft_counts(fen, counts, use_table):
+    board = ChessBoard.from_fen(fen)
+    table = {} if use_table else None
+    for depth, expected in enumerate(counts, 1):
+        assert perft(board, depth, table) == expected
+    # The search leaves the board as it found it
+    assert board.to_fen() == fen
+
+
+@pytest.mark.parametrize("jobs", [2, 16], ids=["root-split", "reply-split"])
+def test_parallel_divide_matches_divide(jobs):
+    board = ChessBoard.from_fen(KIWIPETE)
+    expected = divide(board, 3)
+    assert parallel_divide(board, 3, jobs) == expected
+    assert parallel_perft(board, 3, jobs, use_hash=False) == 97862
+    assert board.to_fen() == KIWIPETE
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from chess_editor.pgn import PgnIndex, build_index, iter_games
+
+WRAPPED_COMMENTS = (
+    b'[Event "First"]\n'
+    b'[White "A"]\n'
+    b'\n'
+    b'1. e4 {a long comment that wraps\n'
+    b'[%clk 0:01:00]} e5 {another one\r\n'
+    b'[%eval 0.3]} 1-0\n'
+    b'\n'
+    b'[Event "Second"]\r\n'
+    b'[White "B"]\r\n'
+    b'\r\n'
+    b'1. d4 d5 0-1\r\n'
+)
+
+
+def test_wrapped_comment_does_not_start_a_game(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(WRAPPED_COMMENTS)
+    games = list(iter_games(path))
+    assert [game.headers["Event"] for game in games] == ["First", "Second"]
+    assert games[0].movetext == "1. e4 {a long comment that wraps [%clk 0:01:00]} e5 {another one [%eval 0.3]} 1-0"
+    assert games[1].movetext == "1. d4 d5 0-1"
+
+
+def test_index_matches_reader(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(WRAPPED_COMMENTS)
+    build_index(path)
+    with PgnIndex(path) as index:
+        assert len(index) == 2
+        assert [index.header(i, "White") for i in range(2)] == ["A", "B"]
+        assert [index.read_game(i) for i in range(2)] == list(iter_games(path))
+
+
+def test_index_bounds(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(WRAPPED_COMMENTS)
+    build_index(path)
+    with PgnIndex(path) as index:
+        for number in (-1, 2):
+            with pytest.raises(IndexError):
+                index.offset(number)
+            with pytest.raises(IndexError):
+                index.header(number, "Event")
+            with pytest.raises(IndexError):
+                index.read_game(number)
+
+
+@pytest.mark.parametrize("keep", [10, 60])
+def test_truncated_index(tmp_path, keep):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(WRAPPED_COMMENTS)
+    index_path = build_index(path)
+    index_path.write_bytes(index_path.read_bytes()[:keep])
+    with pytest.raises(ValueError, match="Truncated"):
+        PgnIndex(path)
+
+
+def test_byte_order_mark_is_skipped(tmp_path):
+    path = tmp_path / "games.pgn"
+    data = b'\xef\xbb\xbf\r\n[Event "A"]\n[White "W"]\n\n1. e4 1-0\n\n[Event "B"]\n\n1. d4 0-1\n'
+    path.write_bytes(data)
+    games = list(iter_games(path))
+    assert [(game.offset, game.headers["Event"]) for game in games] == [(5, "A"), (data.index(b'[Event "B"]'), "B")]
+    assert games[0].headers["White"] == "W"
+    build_index(path)
+    with PgnIndex(path) as index:
+        assert [index.header(i, "Event") for i in range(len(index))] == ["A", "B"]
+        assert index.offset(0) == 5
+
+
+def test_brace_in_line_comment_does_not_open_a_comment(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(b'[Event "A"]\n\n1. e4 ; a {x\n[Event "B"]\n\n1. d4 {a ; b} {c\n[%clk 0:01:00]} 0-1\n')
+    games = list(iter_games(path))
+    assert [game.headers["Event"] for game in games] == ["A", "B"]
+    assert games[1].movetext == "1. d4 {a ; b} {c [%clk 0:01:00]} 0-1"
+
+
+def test_unknown_header_field(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(WRAPPED_COMMENTS)
+    build_index(path, fields=("Event", "White"))
+    with PgnIndex(path) as index:
+        with pytest.raises(KeyError, match="'Opening'.*Event, White"):
+            index.header(0, "Opening")
+
+
+def test_same_size_rewrite_is_stale(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_bytes(WRAPPED_COMMENTS)
+    build_index(path)
+    stat = path.stat()
+    path.write_bytes(WRAPPED_COMMENTS.replace(b'"A"', b'"Z"'))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with pytest.raises(ValueError, match="stale"):
+        PgnIndex(path)
@@ -0,0 +1,38 @@
+import pytest
+
+from chess_editor.board import ChessBoard
+from chess_editor.notation import parse_uci
+from chess_editor.see import is_hanging, see
+
+
+@pytest.mark.parametrize(
+    ("fen", "uci", "expected"),
+    [
+        # Pawn wins outright, the rook is not recaptured
+        ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),
+        # Knight for pawn: the whole exchange on e5 loses 220
+        ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -220),
+        # The rook behind the first one recaptures through it
+        ("k3r3/8/8/4p3/8/8/4R3/4R1K1 w - - 0 1", "e2e5", 100),
+        ("k3r3/8/8/4p3/8/8/4R3/6K1 w - - 0 1", "e2e5", -400),
+        # En passant, then with the c7 pawn recapturing
+        ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", 100),
+        ("4k3/2p5/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", 0),
+        # Promotions: quiet, onto an attacked square, and capturing
+        ("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8q", 800),
+        ("1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a7a8q", -100),
+        ("rr2k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7a8q", 400),
+    ],
+)
+def test_see(fen, uci, expected):
+    board = ChessBoard.from_fen(fen)
+    move = parse_uci(board, uci)
+    assert see(board, move) == expected
+    assert see(board, move.pack()) == expected
+
+
+def test_is_hanging():
+    board = ChessBoard.from_fen("4k3/8/8/3p4/4N3/8/8/4K3 w - - 0 1")
+    assert is_hanging(board, 36)
+    assert not is_hanging(board, 27)
+    assert not is_hanging(board, 44)
@@ -0,0 +1,106 @@
+import pytest
+
+from chess_editor.board import ENCODED_SIZE, ChessBoard, Move, STARTING_FEN
+from chess_editor.movegen import legal_moves
+from chess_editor.position import POSITION_SIZE, Position
+
+FENS = [
+    STARTING_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "4k3/8/8/8/8/8/8/4K3 b - - 99 120",
+    "8/8/8/8/8/8/8/8 w - - 0 1",
+]
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_fen_round_trip(fen):
+    assert ChessBoard.from_fen(fen).to_fen() == fen
+    assert Position.from_fen(fen).to_fen() == fen
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_board_bytes_round_trip(fen):
+    board = ChessBoard.from_fen(fen)
+    data = board.to_bytes()
+    assert len(data) == ENCODED_SIZE
+    decoded = ChessBoard.from_buffer(b"\xff" + data, 1)
+    assert decoded == board
+    assert decoded.bitboards == board.bitboards
+    assert decoded.to_bytes() == data
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_position_bytes_round_trip(fen):
+    position = Position.from_fen(fen)
+    data = position.to_bytes()
+    assert len(data) == POSITION_SIZE
+    assert Position.from_buffer(data) == position
+    assert Position.from_buffer(data).to_fen() == fen
+
+
+def test_from_buffer_rejects_bad_input():
+    with pytest.raises(ValueError):
+        ChessBoard.from_buffer(bytes(ENCODED_SIZE - 1))
+    with pytest.raises(ValueError):
+        ChessBoard.from_buffer(b"\xd0" + bytes(ENCODED_SIZE - 1))
+
+
+@pytest.mark.parametrize("fen", [
+    "",
+    "8/8/8/8/8/8/8 w - - 0 1",
+    "9/8/8/8/8/8/8/8 w - - 0 1",
+    "8/8/8/8/8/8/8/8 x - - 0 1",
+    "8/8/8/8/8/8/8/8 w X - 0 1",
+    "8/8/8/8/8/8/8/8 w - z9 0 1",
+])
+def test_invalid_fen(fen):
+    with pytest.raises(ValueError):
+        ChessBoard.from_fen(fen)
+
+
+@pytest.mark.parametrize("fen", [
+    # No black pawn on e5 for the capture to take
+    "4k3/8/8/3P4/8/8/8/4K3 w - e6 0 1",
+    # The pawn could not have come from e7
+    "4k3/4b3/8/3Pp3/8/8/8/4K3 w - e6 0 1",
+    # The en-passant square itself is occupied
+    "4k3/8/4n3/3Pp3/8/8/8/4K3 w - e6 0 1",
+    # No white pawn next to d4 can capture
+    "4k3/8/8/8/3P4/8/8/4K3 b - d3 0 1",
+])
+def test_impossible_en_passant_square_is_dropped(fen):
+    board = ChessBoard.from_fen(fen)
+    assert board.ep_square is None
+    without_ep = fen.replace(fen.split()[3], "-")
+    assert legal_moves(board) == legal_moves(ChessBoard.from_fen(without_ep))
+
+
+def test_possible_en_passant_square_is_kept():
+    board = ChessBoard.from_fen("4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1")
+    assert board.ep_square == 20
+    assert Move(27, 20) in legal_moves(board)
+
+
+def test_zero_fullmove_number_is_clamped():
+    assert ChessBoard.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 0").to_fen() == "4k3/8/8/8/8/8/8/4K3 w - - 0 1"
+    assert Position.from_fen("4k3/8/8/8/8/8/8/4K3 b - - 3 0").fullmove_number == 1
+
+
+@pytest.mark.parametrize("counters", ["-1 1", "0 -1", "x 1", "0 y"])
+def test_invalid_move_counters(counters):
+    with pytest.raises(ValueError):
+        ChessBoard.from_fen(f"4k3/8/8/8/8/8/8/4K3 w - - {counters}")
+
+
+def test_position_placement_carries_state():
+    fen = "r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 5 40"
+    position = Position.from_fen(fen)
+    placement = position.placement
+    assert (placement.turn, placement.castling_rights, placement.halfmove_clock, placement.fullmove_number) == (
+        position.turn, position.castling_rights, position.halfmove_clock, position.fullmove_number,
+    )
+    assert ChessBoard.from_snapshot(placement).to_fen() == fen
+    assert ChessBoard.from_snapshot(Position.from_buffer(position.to_bytes()).placement).to_fen() == fen
@@ -0,0 +1,72 @@
+from itertools import product
+
+import pytest
+
+from chess_editor.board import STARTING_FEN, ChessBoard, PieceColor
+from chess_editor.symmetry import canonical_key, canonical_position
+from chess_editor.utils.bitboard import flip_diagonal, flip_vertical, mirror_horizontal
+
+WITH_CASTLING = [STARTING_FEN, "r3k3/8/8/8/8/8/8/4K2R w Kq - 0 1"]
+WITH_PAWNS = ["8/5k2/8/2pP4/8/1K6/8/8 w - c6 0 1", "4k3/1p6/8/8/8/8/6PP/3K4 b - - 0 1"]
+PAWNLESS = ["8/8/3k4/8/2R5/8/5K2/8 b - - 3 40", "1n6/8/8/4k3/8/2Q5/6K1/8 w - - 0 1"]
+
+
+def transformed(board, steps=(), flip_colors=False):
+    # The board with every step applied to its squares, optionally with the colors swapped
+    bitboards, ep = list(board.bitboards), board.ep_square
+    if flip_colors:
+        bitboards = [flip_vertical(mask) for mask in bitboards[6:] + bitboards[:6]]
+        ep = None if ep is None else ep ^ 56
+    for step in steps:
+        bitboards = [step(mask) for mask in bitboards]
+        ep = None if ep is None else step(1 << ep).bit_length() - 1
+    result = ChessBoard.from_bitboards(bitboards)
+    if flip_colors:
+        result.turn = PieceColor.WHITE if board.turn is PieceColor.BLACK else PieceColor.BLACK
+        result.castling_rights = board.castling_rights >> 2 | (board.castling_rights & 3) << 2
+    else:
+        result.turn = board.turn
+        result.castling_rights = board.castling_rights
+    result.ep_square = ep
+    return result
+
+
+def placement(board):
+    return board.to_fen().split()[0]
+
+
+@pytest.mark.parametrize("fen", WITH_CASTLING + WITH_PAWNS + PAWNLESS)
+def test_color_flip_keeps_key(fen):
+    board = ChessBoard.from_fen(fen)
+    assert canonical_key(transformed(board, flip_colors=True)) == canonical_key(board)
+
+
+@pytest.mark.parametrize("fen", WITH_PAWNS + PAWNLESS)
+def test_mirror_keeps_key_without_castling(fen):
+    board = ChessBoard.from_fen(fen)
+    for flip_colors in (False, True):
+        assert canonical_key(transformed(board, (mirror_horizontal,), flip_colors)) == canonical_key(board)
+
+
+@pytest.mark.parametrize("fen", PAWNLESS)
+def test_pawnless_positions_share_all_symmetries(fen):
+    board = ChessBoard.from_fen(fen)
+    key = canonical_key(board)
+    for used in product((False, True), repeat=3):
+        steps = [step for step, on in zip((flip_diagonal, flip_vertical, mirror_horizontal), used) if on]
+        assert canonical_key(transformed(board, steps)) == key
+
+
+def test_castling_rights_turn_mirrors_off():
+    board = ChessBoard.from_fen("r3k3/8/8/8/8/8/8/4K2R w Kq - 0 1")
+    unmirrored = {placement(board), placement(transformed(board, flip_colors=True))}
+    assert placement(canonical_position(board).to_board()) in unmirrored
+    board.castling_rights = 0
+    assert placement(canonical_position(board).to_board()) not in unmirrored
+    assert canonical_key(transformed(board, (mirror_horizontal,))) == canonical_key(board)
+
+
+@pytest.mark.parametrize("fen", WITH_CASTLING + WITH_PAWNS + PAWNLESS)
+def test_canonical_position_key_matches_canonical_key(fen):
+    board = ChessBoard.from_fen(fen)
+    assert canonical_position(board).key == canonical_key(board)
@@ -0,0 +1,40 @@
+import pytest
+
+from chess_editor.batch import BoardBatch
+from chess_editor.position import Position
+from chess_editor.validation import (
+    BAD_CASTLING_RIGHTS, BAD_KING_COUNT, OPPONENT_IN_CHECK, PAWN_ON_BACK_RANK, validate,
+)
+
+CASES = [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 0),
+    ("4k3/8/8/8/8/8/8/8 w - - 0 1", BAD_KING_COUNT),
+    ("4k3/8/8/8/8/8/8/3KK3 w - - 0 1", BAD_KING_COUNT),
+    ("P3k3/8/8/8/8/8/8/4K3 w - - 0 1", PAWN_ON_BACK_RANK),
+    ("4k3/8/8/8/8/8/8/4K2p b - - 0 1", PAWN_ON_BACK_RANK),
+    # White to move while the black king is attacked
+    ("4k3/8/8/8/8/8/8/4K2R w - - 0 1", 0),
+    ("4k3/8/8/8/8/8/8/4R1K1 w - - 0 1", OPPONENT_IN_CHECK),
+    ("4k3/8/8/8/8/8/8/4R1K1 b - - 0 1", 0),
+    ("4k3/3P4/8/8/8/8/8/4K3 w - - 0 1", OPPONENT_IN_CHECK),
+    ("4k3/8/5N2/8/8/8/8/4K3 w - - 0 1", OPPONENT_IN_CHECK),
+    ("4k3/8/8/8/B7/8/8/4K3 w - - 0 1", OPPONENT_IN_CHECK),
+    ("4k3/8/8/8/B7/8/2n5/4K3 w - - 0 1", OPPONENT_IN_CHECK),
+    ("4k3/8/8/1n6/B7/8/8/4K3 w - - 0 1", 0),
+    ("8/8/8/8/8/8/8/3kK3 b - - 0 1", OPPONENT_IN_CHECK),
+    ("4k3/8/8/8/8/8/8/R3K3 w K - 0 1", BAD_CASTLING_RIGHTS),
+    ("4k3/8/8/8/8/8/8/R3K3 w Q - 0 1", 0),
+    ("r3k3/8/8/8/8/8/8/4K3 w q - 0 1", 0),
+    ("P3k3/8/8/8/8/8/8/4R1K1 w k - 0 1", PAWN_ON_BACK_RANK | OPPONENT_IN_CHECK | BAD_CASTLING_RIGHTS),
+]
+
+
+@pytest.mark.parametrize("fen, flags", CASES)
+def test_validate(fen, flags):
+    batch = BoardBatch.from_position_buffer(Position.from_fen(fen).to_bytes())
+    assert validate(batch).tolist() == [flags]
+
+
+def test_validate_whole_batch():
+    batch = BoardBatch.from_position_buffer(b"".join(Position.from_fen(fen).to_bytes() for fen, _ in CASES))
+    assert validate(batch).tolist() == [flags for _, flags in CASES]